@@ -0,0 +1,49 @@
+"""comment composite indexes
+
+Revision ID: 3f1c9a7d2b10
+Revises:
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_comment_video_top_likes", ["video_id", "is_top_level", "like_count"]),
+    ("ix_comment_video_top_published", ["video_id", "is_top_level", "published_at"]),
+    ("ix_comment_parent_published", ["parent_comment_id", "published_at"]),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                "comments",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(
+                name,
+                table_name="comments",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,55 @@
+"""partial status indexes
+
+Revision ID: 8b2e4d6f1a37
+Revises: 3f1c9a7d2b10
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d6f1a37'
+down_revision: Union[str, None] = '3f1c9a7d2b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_dlq_active",
+            "download_queue",
+            [sa.text("priority DESC"), sa.text("created_at ASC")],
+            postgresql_where=sa.text("status IN ('queued', 'downloading', 'failed')"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_videos_downloaded_size",
+            "videos",
+            ["video_size_bytes"],
+            postgresql_where=sa.text("is_downloaded = true"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_videos_downloaded_size",
+            table_name="videos",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_dlq_active",
+            table_name="download_queue",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
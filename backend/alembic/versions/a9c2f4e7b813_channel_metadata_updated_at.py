@@ -0,0 +1,29 @@
+"""channel metadata updated at
+
+Revision ID: a9c2f4e7b813
+Revises: e5d8f3a2c691
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c2f4e7b813'
+down_revision: Union[str, None] = 'e5d8f3a2c691'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # init_db (or create_all on a fresh install) may already have added it
+    op.execute(
+        "ALTER TABLE channels ADD COLUMN IF NOT EXISTS metadata_updated_at TIMESTAMPTZ"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE channels DROP COLUMN IF EXISTS metadata_updated_at")
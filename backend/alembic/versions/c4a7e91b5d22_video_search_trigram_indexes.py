@@ -0,0 +1,51 @@
+"""video search trigram indexes
+
+Revision ID: c4a7e91b5d22
+Revises: 8b2e4d6f1a37
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e91b5d22'
+down_revision: Union[str, None] = '8b2e4d6f1a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_videos_title_trgm", "title"),
+    ("ix_videos_desc_trgm", "description"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES:
+            op.create_index(
+                name,
+                "videos",
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(
+                name,
+                table_name="videos",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,41 @@
+"""sync jobs completed index
+
+Revision ID: e5d8f3a2c691
+Revises: c4a7e91b5d22
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5d8f3a2c691'
+down_revision: Union[str, None] = 'c4a7e91b5d22'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_syncjobs_completed_desc",
+            "sync_jobs",
+            [sa.text("completed_at DESC")],
+            postgresql_where=sa.text("status = 'completed'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_syncjobs_completed_desc",
+            table_name="sync_jobs",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
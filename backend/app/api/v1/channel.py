@@ -1,17 +1,111 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
 from fastapi.responses import FileResponse
-from sqlalchemy import select, func
+from sqlalchemy import select, func, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
-import os
-
-from app.db.database import get_db
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from app.db.database import AsyncSessionLocal, get_db
 from app.models.channel import Channel
 from app.models.video import Video
 from app.schemas.channel import ChannelResponse, ChannelConfig, ChannelListResponse
+from app.services.file_cache import FileStat, find_channel_image
 from app.services.youtube_api import youtube_api
 from app.config import settings
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+IMAGE_CACHE_CONTROL = "public, max-age=86400"
+# Versioned image URLs (?v=...) change whenever the file does
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+CHANNEL_IMAGE_CACHE_SECONDS = 5
+
+
+def _channel_by_id(channel_id: int):
+    """SELECT for one channel; the lambda lets SQLAlchemy reuse the compiled SQL"""
+    return lambda_stmt(lambda: select(Channel).where(Channel.id == channel_id))
+
+
+class ChannelImagePaths(NamedTuple):
+    banner: Optional[str]
+    avatar: Optional[str]
+
+
+# channel_id -> (fetched_at, paths); shared by the banner and avatar handlers
+_channel_image_paths: Dict[int, Tuple[float, ChannelImagePaths]] = {}
+
+
+async def _get_channel_image_paths(db: AsyncSession, channel_id: int) -> Optional[ChannelImagePaths]:
+    """Local image paths for a channel, cached for CHANNEL_IMAGE_CACHE_SECONDS"""
+    now = time.monotonic()
+    cached = _channel_image_paths.get(channel_id)
+    if cached and now - cached[0] < CHANNEL_IMAGE_CACHE_SECONDS:
+        return cached[1]
+
+    result = await db.execute(
+        select(Channel.banner_local_path, Channel.avatar_local_path)
+        .where(Channel.id == channel_id)
+    )
+    row = result.one_or_none()
+    if not row:
+        return None
+
+    paths = ChannelImagePaths(*row)
+    _channel_image_paths[channel_id] = (now, paths)
+    return paths
+
+
+def _conditional_file(request: Request, path: str, stat: FileStat) -> Response:
+    """Serve an image file, answering 304 when the client copy is current"""
+    mtime = stat.mtime_ns / 1_000_000_000
+    etag = f'"{stat.mtime_ns:x}-{stat.size:x}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(mtime, usegmt=True),
+        "Cache-Control": (
+            IMMUTABLE_CACHE_CONTROL
+            if request.query_params.get("v") == stat.version
+            else IMAGE_CACHE_CONTROL
+        ),
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                if int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp():
+                    return Response(status_code=304, headers=headers)
+            except (TypeError, ValueError):
+                pass
+
+    accel_uri = settings.accel_redirect_uri(path)
+    if accel_uri:
+        # Let the reverse proxy send the file straight from disk
+        headers["X-Accel-Redirect"] = accel_uri
+        return Response(media_type="image/jpeg", headers=headers)
+
+    return FileResponse(path, media_type="image/jpeg", headers=headers)
+
+
+async def _channel_response(channel: Channel) -> ChannelResponse:
+    """ChannelResponse for a channel, with its image version tokens"""
+    response = ChannelResponse.model_validate(channel)
+    banner, avatar = await asyncio.gather(
+        find_channel_image(channel.id, channel.banner_local_path, "banner"),
+        find_channel_image(channel.id, channel.avatar_local_path, "avatar"),
+    )
+    response.banner_version = banner[1].version if banner else None
+    response.avatar_version = avatar[1].version if avatar else None
+    return response
 
 
 @router.get("", response_model=ChannelListResponse)
@@ -22,38 +116,80 @@ async def list_channels(db: AsyncSession = Depends(get_db)):
     )
     channels = result.scalars().all()
 
-    return ChannelListResponse(
-        channels=[ChannelResponse.model_validate(c) for c in channels],
-        total=len(channels)
-    )
+    responses = await asyncio.gather(*(_channel_response(c) for c in channels))
+    return ChannelListResponse(channels=responses, total=len(channels))
 
 
 @router.get("/{channel_id}", response_model=ChannelResponse)
 async def get_channel(channel_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific channel by ID"""
-    result = await db.execute(
-        select(Channel).where(Channel.id == channel_id)
-    )
+    result = await db.execute(_channel_by_id(channel_id))
     channel = result.scalar_one_or_none()
 
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
 
-    return ChannelResponse.model_validate(channel)
+    return await _channel_response(channel)
+
+
+def _apply_channel_info(channel: Channel, channel_info: dict):
+    """Copy metadata fetched from YouTube onto a channel row"""
+    channel.title = channel_info.get("title", channel.title)
+    channel.description = channel_info.get("description")
+    channel.custom_url = channel_info.get("custom_url")
+    channel.subscriber_count = channel_info.get("subscriber_count")
+    channel.video_count = channel_info.get("video_count")
+    channel.view_count = channel_info.get("view_count")
+    channel.avatar_url = channel_info.get("avatar_url")
+    channel.banner_url = channel_info.get("banner_url")
+    channel.metadata_updated_at = datetime.now(timezone.utc)
+
+
+async def _refresh_channel_from_youtube(channel_id: int):
+    """Refresh a channel's metadata after the response has been sent"""
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(_channel_by_id(channel_id))
+            channel = result.scalar_one_or_none()
+            if not channel:
+                return
+
+            channel_info = await youtube_api.get_channel_info(
+                channel.youtube_channel_id, use_cache=False
+            )
+            if channel_info:
+                _apply_channel_info(channel, channel_info)
+                await db.commit()
+    except Exception as e:
+        logger.error(f"Error refreshing channel {channel_id}: {e}")
 
 
 @router.post("", response_model=ChannelResponse)
 async def create_channel(
     config: ChannelConfig,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """Add a new channel to archive"""
-    # Validate API key and channel
-    youtube_api.api_key = config.youtube_api_key
+    # Known channels are returned right away and refreshed in the background
+    # with the current key; the submitted key is only kept if the lookup
+    # below succeeds with it
+    result = await db.execute(
+        select(Channel).where(Channel.youtube_channel_id == config.youtube_channel_id)
+    )
+    existing = result.scalar_one_or_none()
+    if existing:
+        background_tasks.add_task(_refresh_channel_from_youtube, existing.id)
+        return await _channel_response(existing)
 
+    # Validate API key and channel; the previous key is put back if that fails
+    previous_key = youtube_api.api_key
+    youtube_api.api_key = config.youtube_api_key
     try:
-        # Try to get channel info
-        channel_info = await youtube_api.get_channel_info(config.youtube_channel_id)
+        # Try to get channel info; skip the cache so the key is really checked
+        channel_info = await youtube_api.get_channel_info(
+            config.youtube_channel_id, use_cache=False
+        )
 
         if not channel_info:
             # Try as username/handle
@@ -62,50 +198,32 @@ async def create_channel(
         if not channel_info:
             raise HTTPException(status_code=400, detail="Could not find channel. Check the channel ID or handle.")
     except ValueError as e:
+        youtube_api.api_key = previous_key
         raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
+        youtube_api.api_key = previous_key
         raise
     except Exception as e:
+        youtube_api.api_key = previous_key
         raise HTTPException(status_code=400, detail=f"YouTube API error: {str(e)}")
 
-    # Check if channel already exists
+    # Check if channel already exists (e.g. it was added by handle)
     result = await db.execute(
         select(Channel).where(
             Channel.youtube_channel_id == channel_info["youtube_channel_id"]
         )
     )
-    existing = result.scalar_one_or_none()
+    channel = result.scalar_one_or_none()
 
-    if existing:
-        # Update existing channel info
-        existing.title = channel_info.get("title", existing.title)
-        existing.description = channel_info.get("description")
-        existing.custom_url = channel_info.get("custom_url")
-        existing.subscriber_count = channel_info.get("subscriber_count")
-        existing.video_count = channel_info.get("video_count")
-        existing.view_count = channel_info.get("view_count")
-        existing.avatar_url = channel_info.get("avatar_url")
-        existing.banner_url = channel_info.get("banner_url")
-        channel = existing
-    else:
+    if not channel:
         # Create new channel (don't delete existing ones - multi-channel support)
-        channel = Channel(
-            youtube_channel_id=channel_info["youtube_channel_id"],
-            title=channel_info.get("title", ""),
-            description=channel_info.get("description"),
-            custom_url=channel_info.get("custom_url"),
-            subscriber_count=channel_info.get("subscriber_count"),
-            video_count=channel_info.get("video_count"),
-            view_count=channel_info.get("view_count"),
-            avatar_url=channel_info.get("avatar_url"),
-            banner_url=channel_info.get("banner_url"),
-        )
+        channel = Channel(youtube_channel_id=channel_info["youtube_channel_id"])
         db.add(channel)
+    _apply_channel_info(channel, channel_info)
 
     await db.commit()
-    await db.refresh(channel)
 
-    return ChannelResponse.model_validate(channel)
+    return await _channel_response(channel)
 
 
 @router.delete("/{channel_id}")
@@ -115,19 +233,19 @@ async def delete_channel(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a channel and optionally its videos"""
+    # Fetch the channel together with its video count
     result = await db.execute(
-        select(Channel).where(Channel.id == channel_id)
+        select(Channel, func.count(Video.id))
+        .outerjoin(Video, Video.channel_id == Channel.id)
+        .where(Channel.id == channel_id)
+        .group_by(Channel.id)
     )
-    channel = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not channel:
+    if not row:
         raise HTTPException(status_code=404, detail="Channel not found")
 
-    # Get video count for this channel
-    video_count_result = await db.execute(
-        select(func.count(Video.id)).where(Video.channel_id == channel_id)
-    )
-    video_count = video_count_result.scalar()
+    channel, video_count = row
 
     if video_count > 0 and not delete_videos:
         raise HTTPException(
@@ -138,52 +256,45 @@ async def delete_channel(
     # Delete the channel (videos will cascade delete if configured)
     await db.delete(channel)
     await db.commit()
+    _channel_image_paths.pop(channel_id, None)
 
     return {"status": "deleted", "channel_id": channel_id, "videos_deleted": video_count if delete_videos else 0}
 
 
 @router.get("/{channel_id}/banner")
-async def get_channel_banner(channel_id: int, db: AsyncSession = Depends(get_db)):
+async def get_channel_banner(
+    channel_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
     """Get the channel banner image"""
-    result = await db.execute(
-        select(Channel).where(Channel.id == channel_id)
-    )
-    channel = result.scalar_one_or_none()
+    image_paths = await _get_channel_image_paths(db, channel_id)
 
-    if not channel:
+    if not image_paths:
         raise HTTPException(status_code=404, detail="Channel not found")
 
-    # Try local path first
-    if channel.banner_local_path and os.path.exists(channel.banner_local_path):
-        return FileResponse(channel.banner_local_path, media_type="image/jpeg")
-
-    # Check storage path
-    banner_path = os.path.join(settings.channel_path, f"{channel.id}_banner.jpg")
-    if os.path.exists(banner_path):
-        return FileResponse(banner_path, media_type="image/jpeg")
+    found = await find_channel_image(channel_id, image_paths.banner, "banner")
+    if found:
+        return _conditional_file(request, *found)
 
     raise HTTPException(status_code=404, detail="Banner not found")
 
 
 @router.get("/{channel_id}/avatar")
-async def get_channel_avatar(channel_id: int, db: AsyncSession = Depends(get_db)):
+async def get_channel_avatar(
+    channel_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
     """Get the channel avatar image"""
-    result = await db.execute(
-        select(Channel).where(Channel.id == channel_id)
-    )
-    channel = result.scalar_one_or_none()
+    image_paths = await _get_channel_image_paths(db, channel_id)
 
-    if not channel:
+    if not image_paths:
         raise HTTPException(status_code=404, detail="Channel not found")
 
-    # Try local path first
-    if channel.avatar_local_path and os.path.exists(channel.avatar_local_path):
-        return FileResponse(channel.avatar_local_path, media_type="image/jpeg")
-
-    # Check storage path
-    avatar_path = os.path.join(settings.channel_path, f"{channel.id}_avatar.jpg")
-    if os.path.exists(avatar_path):
-        return FileResponse(avatar_path, media_type="image/jpeg")
+    found = await find_channel_image(channel_id, image_paths.avatar, "avatar")
+    if found:
+        return _conditional_file(request, *found)
 
     raise HTTPException(status_code=404, detail="Avatar not found")
 
@@ -192,7 +303,8 @@ async def get_channel_avatar(channel_id: int, db: AsyncSession = Depends(get_db)
 @router.put("/config", response_model=ChannelResponse)
 async def configure_channel_legacy(
     config: ChannelConfig,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """Legacy endpoint - redirects to create_channel"""
-    return await create_channel(config, db)
+    return await create_channel(config, background_tasks, db)
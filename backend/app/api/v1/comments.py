@@ -1,42 +1,48 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from typing import Literal
 
 from app.db.database import get_db
 from app.models.comment import Comment
 from app.models.video import Video
-from app.schemas.comment import CommentResponse, CommentListResponse
+from app.schemas.comment import CommentListResponse, comment_list_adapter
 
 router = APIRouter()
 
 
+async def _page_total(db: AsyncSession, rows, offset: int, filters) -> int:
+    """Total row count for a page fetched with a COUNT(*) OVER () column"""
+    if rows:
+        return rows[0].total
+    if offset == 0:
+        return 0
+    # Page past the end returns no rows to carry the window count
+    result = await db.execute(select(func.count(Comment.id)).where(*filters))
+    return result.scalar()
+
+
 @router.get("/video/{video_id}", response_model=CommentListResponse)
 async def get_video_comments(
     video_id: int,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    sort_by: str = Query("top", regex="^(top|newest)$"),
+    sort_by: Literal["top", "newest"] = Query("top"),
     db: AsyncSession = Depends(get_db)
 ):
     """Get comments for a video"""
     # Check video exists
     video_result = await db.execute(
-        select(Video).where(Video.id == video_id)
+        select(1).where(Video.id == video_id).limit(1)
     )
-    if not video_result.scalar_one_or_none():
+    if video_result.scalar() is None:
         raise HTTPException(status_code=404, detail="Video not found")
 
-    # Get top-level comments only
-    query = select(Comment).where(
-        Comment.video_id == video_id,
-        Comment.is_top_level == True
-    )
-
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Get top-level comments only, with the total count computed alongside the page
+    filters = (Comment.video_id == video_id, Comment.is_top_level == True)
+    query = select(Comment, func.count().over().label("total")).where(*filters)
 
     # Apply sorting
     if sort_by == "top":
@@ -49,54 +55,56 @@ async def get_video_comments(
     query = query.offset(offset).limit(per_page)
 
     result = await db.execute(query)
-    comments = result.scalars().all()
-
-    # Helper function to convert comment to dict without the SQLAlchemy replies relationship
-    def comment_to_dict(c, include_replies=None):
-        return {
-            "id": c.id,
-            "youtube_comment_id": c.youtube_comment_id,
-            "video_id": c.video_id,
-            "parent_comment_id": c.parent_comment_id,
-            "author_name": c.author_name,
-            "author_channel_id": c.author_channel_id,
-            "author_profile_image_url": c.author_profile_image_url,
-            "text_original": c.text_original,
-            "text_display": c.text_display,
-            "like_count": c.like_count,
-            "reply_count": c.reply_count,
-            "published_at": c.published_at,
-            "is_top_level": c.is_top_level,
-            "created_at": c.created_at,
-            "replies": include_replies or []
-        }
-
-    # Load replies for each comment
-    comment_responses = []
-    for comment in comments:
+    rows = result.all()
+    comments = [row.Comment for row in rows]
+    total = await _page_total(db, rows, offset, filters)
+
+    # Load the first replies for every comment on the page in a single query,
+    # ranking replies per parent so the initial limit applies to each thread
+    replies = []
+    if comments:
+        ranked = (
+            select(
+                Comment.id,
+                func.row_number().over(
+                    partition_by=Comment.parent_comment_id,
+                    order_by=Comment.published_at.asc()
+                ).label("rn")
+            )
+            .where(Comment.parent_comment_id.in_([c.id for c in comments]))
+            .subquery()
+        )
         replies_result = await db.execute(
             select(Comment)
-            .where(Comment.parent_comment_id == comment.id)
-            .order_by(Comment.published_at.asc())
-            .limit(5)  # Limit initial replies
+            .join(ranked, Comment.id == ranked.c.id)
+            .where(ranked.c.rn <= 5)  # Limit initial replies
+            .order_by(Comment.parent_comment_id, Comment.published_at.asc())
         )
         replies = replies_result.scalars().all()
 
-        # Build replies list (replies don't have nested replies)
-        reply_responses = [CommentResponse(**comment_to_dict(r)) for r in replies]
-
-        # Create comment response with replies included
-        comment_responses.append(CommentResponse(**comment_to_dict(comment, reply_responses)))
+    # Threads are returned flat; the index lets clients attach replies by id.
+    # Keys are strings since JSON object keys must be
+    replies_index = {}
+    for reply in replies:
+        replies_index.setdefault(str(reply.parent_comment_id), []).append(reply.id)
 
     total_pages = (total + per_page - 1) // per_page
 
-    return CommentListResponse(
-        comments=comment_responses,
-        total=total,
-        page=page,
-        per_page=per_page,
-        total_pages=total_pages
-    )
+    # Validate rows with the shared adapter and serialize them directly rather
+    # than building and re-validating the envelope
+    return ORJSONResponse({
+        "comments": comment_list_adapter.dump_python(
+            comment_list_adapter.validate_python(comments, from_attributes=True), mode="json"
+        ),
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": total_pages,
+        "replies": comment_list_adapter.dump_python(
+            comment_list_adapter.validate_python(replies, from_attributes=True), mode="json"
+        ),
+        "replies_index": replies_index
+    })
 
 
 @router.get("/{comment_id}/replies", response_model=CommentListResponse)
@@ -109,53 +117,33 @@ async def get_comment_replies(
     """Get replies for a specific comment"""
     # Check comment exists
     comment_result = await db.execute(
-        select(Comment).where(Comment.id == comment_id)
+        select(1).where(Comment.id == comment_id).limit(1)
     )
-    if not comment_result.scalar_one_or_none():
+    if comment_result.scalar() is None:
         raise HTTPException(status_code=404, detail="Comment not found")
 
-    query = select(Comment).where(
-        Comment.parent_comment_id == comment_id
+    filters = (Comment.parent_comment_id == comment_id,)
+    query = select(Comment, func.count().over().label("total")).where(
+        *filters
     ).order_by(Comment.published_at.asc())
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-
     # Apply pagination
     offset = (page - 1) * per_page
     query = query.offset(offset).limit(per_page)
 
     result = await db.execute(query)
-    replies = result.scalars().all()
-
-    # Helper function to convert comment to dict
-    def reply_to_dict(r):
-        return {
-            "id": r.id,
-            "youtube_comment_id": r.youtube_comment_id,
-            "video_id": r.video_id,
-            "parent_comment_id": r.parent_comment_id,
-            "author_name": r.author_name,
-            "author_channel_id": r.author_channel_id,
-            "author_profile_image_url": r.author_profile_image_url,
-            "text_original": r.text_original,
-            "text_display": r.text_display,
-            "like_count": r.like_count,
-            "reply_count": r.reply_count,
-            "published_at": r.published_at,
-            "is_top_level": r.is_top_level,
-            "created_at": r.created_at,
-            "replies": []
-        }
+    rows = result.all()
+    replies = [row.Comment for row in rows]
+    total = await _page_total(db, rows, offset, filters)
 
     total_pages = (total + per_page - 1) // per_page
 
-    return CommentListResponse(
-        comments=[CommentResponse(**reply_to_dict(r)) for r in replies],
-        total=total,
-        page=page,
-        per_page=per_page,
-        total_pages=total_pages
-    )
+    reply_responses = comment_list_adapter.validate_python(replies, from_attributes=True)
+
+    return ORJSONResponse({
+        "comments": comment_list_adapter.dump_python(reply_responses, mode="json"),
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": total_pages
+    })
@@ -1,17 +1,20 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, func, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-import os
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.video import Video
-from app.models.sync import SyncJob, DownloadQueue, ErrorLog
+from app.models.sync import DownloadQueue, ErrorLog
 from app.schemas.status import (
-    OverallStatus, StorageStats, SyncProgress,
+    OverallStatus, StorageStats, SyncProgress, overall_status_adapter,
     ErrorLogResponse, ErrorLogListResponse,
-    DownloadQueueResponse, DownloadQueueItemResponse
+    DownloadQueueResponse
 )
+from app.services.cache import cached
+from app.services.file_cache import disk_usage
+from app.services.status_snapshot import status_snapshot
 from app.tasks.task_manager import task_manager
 from app.tasks.scheduler import sync_scheduler
 from app.config import settings
@@ -19,41 +22,28 @@ from app.config import settings
 router = APIRouter()
 
 
+# (unit, decimal places) for each power of 1024
+_BYTE_UNITS = (("B", 0), ("KB", 1), ("MB", 1), ("GB", 2), ("TB", 2))
+
+
 def format_bytes(size_bytes: int) -> str:
     """Format bytes to human readable string"""
-    if size_bytes < 1024:
-        return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+    index = min(max(size_bytes.bit_length() - 1, 0) // 10, len(_BYTE_UNITS) - 1)
+    unit, precision = _BYTE_UNITS[index]
+    return f"{size_bytes / (1 << (10 * index)):.{precision}f} {unit}"
 
 
 @router.get("", response_model=OverallStatus)
-async def get_overall_status(db: AsyncSession = Depends(get_db)):
+async def get_overall_status():
     """Get overall system status"""
-    # Get storage stats
-    total_videos_result = await db.execute(select(func.count(Video.id)))
-    total_videos = total_videos_result.scalar()
-
-    downloaded_videos_result = await db.execute(
-        select(func.count(Video.id)).where(Video.is_downloaded == True)
-    )
-    downloaded_videos = downloaded_videos_result.scalar()
-
-    total_size_result = await db.execute(
-        select(func.coalesce(func.sum(Video.video_size_bytes), 0))
-        .where(Video.is_downloaded == True)
-    )
-    total_size = total_size_result.scalar() or 0
+    # Database counters come from the periodically refreshed snapshot
+    counters = await status_snapshot.current()
 
     storage_stats = StorageStats(
-        total_videos=total_videos,
-        downloaded_videos=downloaded_videos,
-        total_size_bytes=total_size,
-        total_size_formatted=format_bytes(total_size)
+        total_videos=counters.total_videos,
+        downloaded_videos=counters.downloaded_videos,
+        total_size_bytes=counters.total_size,
+        total_size_formatted=format_bytes(counters.total_size)
     )
 
     # Get sync progress
@@ -68,119 +58,101 @@ async def get_overall_status(db: AsyncSession = Depends(get_db)):
         percent_complete=current_status.get("percent_complete", 0)
     )
 
-    # Get last sync time
-    last_sync_result = await db.execute(
-        select(SyncJob.completed_at)
-        .where(SyncJob.status == "completed")
-        .order_by(SyncJob.completed_at.desc())
-        .limit(1)
-    )
-    last_sync = last_sync_result.scalar_one_or_none()
-
     # Get next auto-sync time
     next_auto_sync = sync_scheduler.get_next_run_time()
 
-    # Get queue length
-    queue_result = await db.execute(
-        select(func.count(DownloadQueue.id))
-        .where(DownloadQueue.status.in_(["queued", "downloading"]))
-    )
-    queue_length = queue_result.scalar()
-
-    # Get recent errors count
-    errors_result = await db.execute(
-        select(func.count(ErrorLog.id))
-    )
-    errors_count = errors_result.scalar()
-
-    return OverallStatus(
+    overall_status = OverallStatus(
         sync_progress=sync_progress,
         storage=storage_stats,
-        last_sync=last_sync,
+        last_sync=counters.last_sync,
         next_auto_sync=next_auto_sync,
-        queue_length=queue_length,
-        errors_count=errors_count
+        queue_length=counters.queue_length,
+        errors_count=counters.errors_count
+    )
+    return Response(
+        content=overall_status_adapter.dump_json(overall_status),
+        media_type="application/json"
     )
 
 
 @router.get("/queue", response_model=DownloadQueueResponse)
-async def get_download_queue(db: AsyncSession = Depends(get_db)):
+async def get_download_queue(
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get download queue status"""
+    statuses = ["queued", "downloading", "failed"]
+
+    # Tally statuses in the database instead of shipping every row to count them
+    counts_result = await db.execute(
+        select(DownloadQueue.status, func.count(DownloadQueue.id))
+        .where(DownloadQueue.status.in_(statuses))
+        .group_by(DownloadQueue.status)
+    )
+    counts = dict(counts_result.all())
+
+    # Project just the columns the response uses rather than both full rows
     result = await db.execute(
-        select(DownloadQueue, Video)
+        select(
+            DownloadQueue.id,
+            DownloadQueue.video_id,
+            Video.title.label("video_title"),
+            Video.youtube_video_id.label("video_youtube_id"),
+            DownloadQueue.status,
+            DownloadQueue.priority,
+            DownloadQueue.progress,
+            DownloadQueue.download_speed,
+            DownloadQueue.eta,
+            DownloadQueue.error_message,
+            DownloadQueue.retry_count,
+            DownloadQueue.created_at,
+            DownloadQueue.started_at
+        )
         .join(Video, DownloadQueue.video_id == Video.id)
-        .where(DownloadQueue.status.in_(["queued", "downloading", "failed"]))
+        .where(DownloadQueue.status.in_(statuses))
         .order_by(DownloadQueue.priority.desc(), DownloadQueue.created_at.asc())
+        .offset(offset)
+        .limit(limit)
     )
-    rows = result.all()
-
-    items = []
-    downloading = 0
-    queued = 0
-    failed = 0
-
-    for queue_item, video in rows:
-        items.append(DownloadQueueItemResponse(
-            id=queue_item.id,
-            video_id=queue_item.video_id,
-            video_title=video.title,
-            video_youtube_id=video.youtube_video_id,
-            status=queue_item.status,
-            priority=queue_item.priority,
-            progress=queue_item.progress,
-            download_speed=queue_item.download_speed,
-            eta=queue_item.eta,
-            error_message=queue_item.error_message,
-            retry_count=queue_item.retry_count,
-            created_at=queue_item.created_at,
-            started_at=queue_item.started_at
-        ))
 
-        if queue_item.status == "downloading":
-            downloading += 1
-        elif queue_item.status == "queued":
-            queued += 1
-        elif queue_item.status == "failed":
-            failed += 1
-
-    return DownloadQueueResponse(
-        items=items,
-        total=len(items),
-        downloading=downloading,
-        queued=queued,
-        failed=failed
-    )
+    # Rows already match DownloadQueueItemResponse; send them without per-item
+    # validation (response_model is kept for the API schema)
+    return ORJSONResponse({
+        "items": [row._asdict() for row in result.all()],
+        "total": sum(counts.values()),
+        "downloading": counts.get("downloading", 0),
+        "queued": counts.get("queued", 0),
+        "failed": counts.get("failed", 0)
+    })
 
 
 @router.get("/storage")
-async def get_storage_info(db: AsyncSession = Depends(get_db)):
+@cached(prefix="status:storage", expire=30)
+async def get_storage_info(db: AsyncSession = Depends(get_read_db)):
     """Get detailed storage information"""
-    # Get total size from database
-    total_size_result = await db.execute(
-        select(func.coalesce(func.sum(Video.video_size_bytes), 0))
+    # Get video count and size by quality; the total is summed from the breakdown
+    quality_result = await db.execute(
+        select(
+            Video.video_quality,
+            func.count(Video.id),
+            func.coalesce(func.sum(Video.video_size_bytes), 0)
+        )
         .where(Video.is_downloaded == True)
+        .group_by(Video.video_quality)
     )
-    db_total = total_size_result.scalar() or 0
+    quality_rows = quality_result.all()
+    quality_breakdown = {row[0] or "unknown": row[1] for row in quality_rows}
+    db_total = sum(row[2] for row in quality_rows)
 
     # Try to get actual disk usage
     disk_total = 0
     disk_free = 0
     try:
-        if os.path.exists(settings.storage_path):
-            stat = os.statvfs(settings.storage_path)
-            disk_total = stat.f_blocks * stat.f_frsize
-            disk_free = stat.f_bavail * stat.f_frsize
+        disk_total, disk_free = await disk_usage(settings.storage_path)
     except Exception:
         pass
 
-    # Get video count by quality
-    quality_result = await db.execute(
-        select(Video.video_quality, func.count(Video.id))
-        .where(Video.is_downloaded == True)
-        .group_by(Video.video_quality)
-    )
-    quality_breakdown = {row[0] or "unknown": row[1] for row in quality_result.all()}
-
     return {
         "videos_size_bytes": db_total,
         "videos_size_formatted": format_bytes(db_total),
@@ -197,34 +169,25 @@ async def get_storage_info(db: AsyncSession = Depends(get_db)):
 async def get_error_logs(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get error logs"""
-    query = select(ErrorLog).order_by(ErrorLog.created_at.desc())
-
     # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
+    total_result = await db.execute(select(func.count(ErrorLog.id)))
     total = total_result.scalar()
 
-    # Apply pagination
+    # Fetch the page with video titles joined in, rather than one lookup per error
     offset = (page - 1) * per_page
-    query = query.offset(offset).limit(per_page)
-
-    result = await db.execute(query)
-    errors = result.scalars().all()
-
-    # Get video titles
-    error_responses = []
-    for error in errors:
-        video_title = None
-        if error.video_id:
-            video_result = await db.execute(
-                select(Video.title).where(Video.id == error.video_id)
-            )
-            video_title = video_result.scalar_one_or_none()
+    result = await db.execute(
+        select(ErrorLog, Video.title.label("video_title"))
+        .outerjoin(Video, Video.id == ErrorLog.video_id)
+        .order_by(ErrorLog.created_at.desc())
+        .offset(offset)
+        .limit(per_page)
+    )
 
-        error_responses.append(ErrorLogResponse(
+    error_responses = [
+        ErrorLogResponse(
             id=error.id,
             sync_job_id=error.sync_job_id,
             video_id=error.video_id,
@@ -232,7 +195,9 @@ async def get_error_logs(
             error_type=error.error_type,
             error_message=error.error_message,
             created_at=error.created_at
-        ))
+        )
+        for error, video_title in result.all()
+    ]
 
     total_pages = (total + per_page - 1) // per_page
 
@@ -247,10 +212,8 @@ async def get_error_logs(
 @router.delete("/errors")
 async def clear_error_logs(db: AsyncSession = Depends(get_db)):
     """Clear all error logs"""
-    await db.execute(select(ErrorLog))  # Placeholder
-    result = await db.execute(select(ErrorLog))
-    errors = result.scalars().all()
-    for error in errors:
-        await db.delete(error)
+    await db.execute(delete(ErrorLog))
     await db.commit()
+    # /status reads errors_count from the snapshot; don't wait for its next tick
+    await status_snapshot.refresh()
     return {"status": "cleared"}
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import time
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.sync import SyncConfig, SyncJob, SyncHistory
 from app.schemas.sync import (
     SyncConfigResponse, SyncConfigUpdate, SyncJobCreate,
-    SyncJobResponse, SyncJobListResponse, SyncHistoryResponse
+    SyncJobResponse, SyncJobListResponse, SyncHistoryResponse,
+    sync_job_list_adapter
 )
 from app.tasks.task_manager import task_manager
 from app.tasks.scheduler import sync_scheduler
@@ -33,7 +35,7 @@ async def start_sync(
         )
         sync_job = result.scalar_one_or_none()
 
-        return SyncJobResponse.model_validate(sync_job)
+        return SyncJobResponse.from_orm_fast(sync_job)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -62,9 +64,8 @@ async def get_sync_config(db: AsyncSession = Depends(get_db)):
         config = SyncConfig()
         db.add(config)
         await db.commit()
-        await db.refresh(config)
 
-    return SyncConfigResponse.model_validate(config)
+    return SyncConfigResponse.from_orm_fast(config)
 
 
 @router.put("/config", response_model=SyncConfigResponse)
@@ -88,7 +89,6 @@ async def update_sync_config(
     config.sync_comments = config_update.sync_comments
 
     await db.commit()
-    await db.refresh(config)
 
     # Update scheduler
     sync_scheduler.configure(
@@ -97,21 +97,20 @@ async def update_sync_config(
         sync_type=config.auto_sync_type
     )
 
-    return SyncConfigResponse.model_validate(config)
+    return SyncConfigResponse.from_orm_fast(config)
 
 
 @router.get("/history", response_model=SyncJobListResponse)
 async def get_sync_history(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get sync job history"""
     query = select(SyncJob).order_by(SyncJob.created_at.desc())
 
     # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
+    total_result = await db.execute(select(func.count(SyncJob.id)))
     total = total_result.scalar()
 
     # Apply pagination
@@ -121,18 +120,20 @@ async def get_sync_history(
     result = await db.execute(query)
     jobs = result.scalars().all()
 
-    return SyncJobListResponse(
-        jobs=[SyncJobResponse.model_validate(j) for j in jobs],
-        total=total,
-        page=page,
-        per_page=per_page
-    )
+    return ORJSONResponse({
+        "jobs": sync_job_list_adapter.dump_python(
+            [SyncJobResponse.from_orm_fast(j) for j in jobs], mode="json"
+        ),
+        "total": total,
+        "page": page,
+        "per_page": per_page
+    })
 
 
 @router.get("/job/{job_id}", response_model=SyncJobResponse)
 async def get_sync_job(
     job_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific sync job"""
     result = await db.execute(
@@ -143,4 +144,7 @@ async def get_sync_job(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    return SyncJobResponse.model_validate(job)
+    return Response(
+        content=SyncJobResponse.from_orm_fast(job).model_dump_json(),
+        media_type="application/json"
+    )
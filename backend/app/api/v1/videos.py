@@ -1,18 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import FileResponse, StreamingResponse
-from sqlalchemy import select, func, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy import select, func, or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import Literal, Optional, Tuple
 from datetime import datetime
+import asyncio
 import os
 
-from app.db.database import get_db
+from app.db.database import get_read_db
 from app.models.video import Video
-from app.schemas.video import VideoResponse, VideoListResponse
+from app.schemas.video import VideoResponse, VideoListResponse, video_list_adapter
+from app.services.file_cache import file_stat_async
 from app.services.video_downloader import video_downloader
+from app.config import settings
 
 router = APIRouter()
 
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def _seek_after(sort_column, descending: bool, cursor: int):
+    """Keyset condition for rows after the cursor video in (sort_column, id) order"""
+    cursor_value = select(sort_column).where(Video.id == cursor).scalar_subquery()
+    if descending:
+        past_value, past_id = sort_column < cursor_value, Video.id < cursor
+    else:
+        past_value, past_id = sort_column > cursor_value, Video.id > cursor
+    # NULL sort values are ordered last
+    return or_(
+        past_value,
+        and_(sort_column == cursor_value, past_id),
+        and_(sort_column.is_(None), or_(cursor_value.isnot(None), past_id))
+    )
+
 
 @router.get("", response_model=VideoListResponse)
 async def list_videos(
@@ -20,72 +40,85 @@ async def list_videos(
     per_page: int = Query(20, ge=1, le=100),
     channel_id: Optional[int] = Query(None, description="Filter by channel ID"),
     search: Optional[str] = None,
-    sort_by: str = Query("upload_date", regex="^(upload_date|title|view_count|duration)$"),
-    sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    sort_by: Literal["upload_date", "title", "view_count", "duration"] = Query("upload_date"),
+    sort_order: Literal["asc", "desc"] = Query("desc"),
     downloaded_only: bool = False,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[int] = Query(None, description="ID of the last video seen; replaces page offset"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List videos with filtering and pagination"""
-    query = select(Video)
+    filters = []
 
     # Filter by channel if specified
     if channel_id is not None:
-        query = query.where(Video.channel_id == channel_id)
+        filters.append(Video.channel_id == channel_id)
 
     # Apply filters
     if search:
-        query = query.where(
+        filters.append(
             or_(
+                # Backed by the pg_trgm GIN indexes on title/description
                 Video.title.ilike(f"%{search}%"),
                 Video.description.ilike(f"%{search}%")
             )
         )
 
     if downloaded_only:
-        query = query.where(Video.is_downloaded == True)
+        filters.append(Video.is_downloaded == True)
 
     if date_from:
-        query = query.where(Video.upload_date >= date_from)
+        filters.append(Video.upload_date >= date_from)
 
     if date_to:
-        query = query.where(Video.upload_date <= date_to)
+        filters.append(Video.upload_date <= date_to)
 
     # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
+    total_result = await db.execute(select(func.count(Video.id)).where(*filters))
     total = total_result.scalar()
 
-    # Apply sorting
+    # Apply sorting, with id as a tiebreaker so pages (and cursors) are stable
     sort_column = getattr(Video, sort_by)
-    if sort_order == "desc":
-        query = query.order_by(sort_column.desc())
+    descending = sort_order == "desc"
+    if descending:
+        query = select(Video).where(*filters).order_by(
+            sort_column.desc().nulls_last(), Video.id.desc()
+        )
     else:
-        query = query.order_by(sort_column.asc())
+        query = select(Video).where(*filters).order_by(
+            sort_column.asc().nulls_last(), Video.id.asc()
+        )
 
-    # Apply pagination
-    offset = (page - 1) * per_page
-    query = query.offset(offset).limit(per_page)
+    # Apply pagination; a cursor seeks past the given video instead of scanning an offset
+    if cursor is not None:
+        query = query.where(_seek_after(sort_column, descending, cursor))
+    else:
+        query = query.offset((page - 1) * per_page)
+    query = query.limit(per_page)
 
     result = await db.execute(query)
     videos = result.scalars().all()
 
     total_pages = (total + per_page - 1) // per_page
 
-    return VideoListResponse(
-        videos=[VideoResponse.model_validate(v) for v in videos],
-        total=total,
-        page=page,
-        per_page=per_page,
-        total_pages=total_pages
-    )
+    # Rows come straight from the database, so skip validation entirely and
+    # serialize the page in one pass (response_model documents the shape)
+    return ORJSONResponse({
+        "videos": video_list_adapter.dump_python(
+            [VideoResponse.from_orm_fast(v) for v in videos], mode="json"
+        ),
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": total_pages
+    })
 
 
 @router.get("/{video_id}", response_model=VideoResponse)
 async def get_video(
     video_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a single video by ID"""
     result = await db.execute(
@@ -96,13 +129,60 @@ async def get_video(
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
 
-    return VideoResponse.model_validate(video)
+    return Response(
+        content=VideoResponse.from_orm_fast(video).model_dump_json(),
+        media_type="application/json"
+    )
+
+
+def _parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single-range 'bytes=' header into inclusive (start, end) offsets"""
+    if not range_header:
+        return None
+    units, _, spec = range_header.partition("=")
+    if units.strip().lower() != "bytes" or "," in spec:
+        # Multipart ranges are not supported; fall back to the whole file
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            # Suffix range: the final N bytes
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+
+async def _iter_file_range(path: str, start: int, length: int):
+    """Read a byte range in fixed-size chunks off the event loop"""
+    fd = await asyncio.to_thread(os.open, path, os.O_RDONLY)
+    try:
+        while length > 0:
+            chunk = await asyncio.to_thread(os.pread, fd, min(STREAM_CHUNK_SIZE, length), start)
+            if not chunk:
+                break
+            start += len(chunk)
+            length -= len(chunk)
+            yield chunk
+    finally:
+        os.close(fd)
 
 
 @router.get("/{video_id}/stream")
 async def stream_video(
     video_id: int,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Stream a video file"""
     result = await db.execute(
@@ -116,20 +196,43 @@ async def stream_video(
     if not video.is_downloaded or not video.video_local_path:
         raise HTTPException(status_code=404, detail="Video not downloaded")
 
-    if not os.path.exists(video.video_local_path):
+    file_stat = await file_stat_async(video.video_local_path)
+    if not file_stat.exists:
         raise HTTPException(status_code=404, detail="Video file not found")
-
-    return FileResponse(
-        video.video_local_path,
+    file_size = file_stat.size
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{video.youtube_video_id}.mp4"',
+    }
+
+    accel_uri = settings.accel_redirect_uri(video.video_local_path)
+    if accel_uri:
+        # The reverse proxy serves the file (and any Range) straight from disk
+        headers["X-Accel-Redirect"] = accel_uri
+        return Response(media_type="video/mp4", headers=headers)
+
+    byte_range = _parse_range(request.headers.get("range"), file_size)
+    if byte_range is None:
+        start, end, status_code = 0, file_size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        _iter_file_range(video.video_local_path, start, end - start + 1),
+        status_code=status_code,
         media_type="video/mp4",
-        filename=f"{video.youtube_video_id}.mp4"
+        headers=headers
     )
 
 
 @router.get("/{video_id}/thumbnail")
 async def get_thumbnail(
     video_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a video's thumbnail"""
     result = await db.execute(
@@ -141,17 +244,17 @@ async def get_thumbnail(
         raise HTTPException(status_code=404, detail="Video not found")
 
     # Try local thumbnail first
-    if video.thumbnail_local_path and os.path.exists(video.thumbnail_local_path):
+    if video.thumbnail_local_path and (await file_stat_async(video.thumbnail_local_path)).exists:
         return FileResponse(
             video.thumbnail_local_path,
             media_type="image/jpeg"
         )
 
     # Try to get from storage
-    thumbnail_path = video_downloader.get_thumbnail_path(video.youtube_video_id)
-    if thumbnail_path and thumbnail_path.exists():
+    thumbnail_path = video_downloader.thumbnail_path(video.youtube_video_id)
+    if (await file_stat_async(thumbnail_path)).exists:
         return FileResponse(
-            str(thumbnail_path),
+            thumbnail_path,
             media_type="image/jpeg"
         )
 
@@ -161,7 +264,7 @@ async def get_thumbnail(
 @router.get("/youtube/{youtube_id}", response_model=VideoResponse)
 async def get_video_by_youtube_id(
     youtube_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a video by YouTube video ID"""
     result = await db.execute(
@@ -172,4 +275,7 @@ async def get_video_by_youtube_id(
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
 
-    return VideoResponse.model_validate(video)
+    return Response(
+        content=VideoResponse.from_orm_fast(video).model_dump_json(),
+        media_type="application/json"
+    )
@@ -1,11 +1,19 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 import logging
+import orjson
 
 from app.tasks.task_manager import task_manager
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+PONG = orjson.dumps({"type": "pong"}).decode()
+
+
+async def _send(websocket: WebSocket, message: dict):
+    """Send a message as an orjson-encoded text frame"""
+    await websocket.send_text(orjson.dumps(message).decode())
+
 
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -16,7 +24,7 @@ async def websocket_endpoint(websocket: WebSocket):
 
     try:
         # Send initial status
-        await websocket.send_json({
+        await _send(websocket, {
             "type": "connected",
             "data": task_manager.get_current_status()
         })
@@ -26,9 +34,9 @@ async def websocket_endpoint(websocket: WebSocket):
             data = await websocket.receive_text()
             # Handle any client messages if needed
             if data == "ping":
-                await websocket.send_json({"type": "pong"})
+                await websocket.send_text(PONG)
             elif data == "status":
-                await websocket.send_json({
+                await _send(websocket, {
                     "type": "status",
                     "data": task_manager.get_current_status()
                 })
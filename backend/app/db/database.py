@@ -1,3 +1,4 @@
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.config import settings
@@ -8,7 +9,14 @@ database_url = settings.database_url
 if database_url.startswith("postgresql://"):
     database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-engine = create_async_engine(database_url, echo=False)
+engine = create_async_engine(
+    database_url,
+    echo=False,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    # No pool_pre_ping: read sessions share this pool, and a liveness round-trip
+    # on every checkout would cost more than the rare stale connection it catches
+)
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -16,6 +24,16 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Same pool, but statements run in autocommit mode so read-only requests
+# skip the BEGIN/ROLLBACK around every query
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 class Base(DeclarativeBase):
     pass
@@ -29,6 +47,22 @@ async def get_db():
             await session.close()
 
 
+async def get_read_db():
+    """Session for read-only endpoints; must not be used to write"""
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 async def init_db():
     async with engine.begin() as conn:
+        # Required by the trigram search indexes on videos
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
+        # create_all never alters existing tables; add columns introduced since
+        # an install was created (mirrors the Alembic migrations)
+        await conn.execute(text(
+            "ALTER TABLE channels ADD COLUMN IF NOT EXISTS metadata_updated_at TIMESTAMPTZ"
+        ))
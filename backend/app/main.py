@@ -1,9 +1,16 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.config import settings
 from app.db.database import init_db
 from app.api.v1.router import api_router
+from app.schemas.comment import CommentResponse
+from app.schemas.video import VideoResponse
+from app.services.cache import cache
+from app.services.status_snapshot import status_snapshot
+from app.services.video_downloader import video_downloader
+from app.services.youtube_api import youtube_api
 from app.tasks.task_manager import task_manager
 from app.tasks.scheduler import sync_scheduler
 
@@ -11,7 +18,12 @@ from app.tasks.scheduler import sync_scheduler
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    # Response schemas are built lazily; build the hot ones before serving
+    VideoResponse.model_rebuild()
+    CommentResponse.model_rebuild()
     await init_db()
+    await cache.connect()
+    status_snapshot.start()
     await task_manager.initialize()
     sync_scheduler.start()
     # Check for incomplete sync jobs to resume
@@ -20,12 +32,36 @@ async def lifespan(app: FastAPI):
     # Shutdown
     sync_scheduler.shutdown()
     await task_manager.shutdown()
+    await status_snapshot.stop()
+    await video_downloader.close()
+    await youtube_api.aclose()
+    await cache.disconnect()
+
+
+class LegacyChannelPathMiddleware:
+    """Rewrite legacy /api/v1/channel paths onto the /api/v1/channels router"""
+
+    legacy_prefix = "/api/v1/channel"
+    prefix = "/api/v1/channels"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            if path == self.legacy_prefix or path.startswith(self.legacy_prefix + "/"):
+                scope = dict(scope)
+                scope["path"] = self.prefix + path[len(self.legacy_prefix):]
+                scope["raw_path"] = scope["path"].encode()
+        await self.app(scope, receive, send)
 
 
 app = FastAPI(
     title="YouTube Channel Archiver",
     description="Archive and browse YouTube channel content",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -38,6 +74,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Support both /channel (legacy) and /channels (new multi-channel)
+app.add_middleware(LegacyChannelPathMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
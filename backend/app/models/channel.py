@@ -6,6 +6,8 @@ from app.db.database import Base
 
 class Channel(Base):
     __tablename__ = "channels"
+    # Fetch server-generated timestamps via RETURNING so writes need no refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     youtube_channel_id = Column(String(50), unique=True, nullable=False, index=True)
@@ -21,6 +23,8 @@ class Channel(Base):
     avatar_local_path = Column(String(500))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Last time the metadata above was fetched from YouTube
+    metadata_updated_at = Column(DateTime(timezone=True))
 
     # Relationships
     videos = relationship("Video", back_populates="channel", cascade="all, delete-orphan")
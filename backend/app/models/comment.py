@@ -1,11 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship, backref
 from sqlalchemy.sql import func
 from app.db.database import Base
 
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # Match the WHERE/ORDER BY of the comment list and replies endpoints
+        Index("ix_comment_video_top_likes", "video_id", "is_top_level", "like_count"),
+        Index("ix_comment_video_top_published", "video_id", "is_top_level", "published_at"),
+        Index("ix_comment_parent_published", "parent_comment_id", "published_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     youtube_comment_id = Column(String(50), unique=True, nullable=False, index=True)
@@ -25,4 +31,10 @@ class Comment(Base):
 
     # Relationships
     video = relationship("Video", back_populates="comments")
-    replies = relationship("Comment", backref="parent", remote_side=[id])
+    # Never lazy-loaded: replies are fetched explicitly (and paginated) by the API
+    replies = relationship(
+        "Comment",
+        backref=backref("parent", remote_side=[id]),
+        lazy="noload",
+        passive_deletes=True,
+    )
@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, Time, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, Time, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.db.database import Base
 
 
 class SyncConfig(Base):
     __tablename__ = "sync_config"
+    # Fetch server-generated timestamps via RETURNING so writes need no refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     auto_sync_enabled = Column(Boolean, default=False)
@@ -33,6 +35,15 @@ class SyncJob(Base):
     resume_from = Column(String(50))  # video_id to resume from
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
+    __table_args__ = (
+        # Latest completed sync lookup for the status page
+        Index(
+            "ix_syncjobs_completed_desc",
+            completed_at.desc(),
+            postgresql_where=status == "completed",
+        ),
+    )
+
 
 class DownloadQueue(Base):
     __tablename__ = "download_queue"
@@ -52,6 +63,16 @@ class DownloadQueue(Base):
     started_at = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
 
+    __table_args__ = (
+        # Active queue listing: filtered by status, ordered by priority then age
+        Index(
+            "ix_dlq_active",
+            priority.desc(),
+            created_at.asc(),
+            postgresql_where=status.in_(["queued", "downloading", "failed"]),
+        ),
+    )
+
 
 class ErrorLog(Base):
     __tablename__ = "error_logs"
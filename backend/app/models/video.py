@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, BigInteger, Boolean, DateTime, ForeignKey, ARRAY
+from sqlalchemy import Column, Integer, String, Text, BigInteger, Boolean, DateTime, ForeignKey, ARRAY, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -31,6 +31,30 @@ class Video(Base):
     metadata_updated_at = Column(DateTime(timezone=True))
     downloaded_at = Column(DateTime(timezone=True))
 
+    __table_args__ = (
+        # Storage totals sum sizes over downloaded videos only
+        Index(
+            "ix_videos_downloaded_size",
+            video_size_bytes,
+            # Same predicate as the migration and the storage queries
+            # (is_downloaded = true), so the planner can match them
+            postgresql_where=is_downloaded == True,
+        ),
+        # Trigram indexes let the '%search%' ILIKE filters use an index (needs pg_trgm)
+        Index(
+            "ix_videos_title_trgm",
+            title,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_videos_desc_trgm",
+            description,
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
+
     # Relationships
     channel = relationship("Channel", back_populates="videos")
     comments = relationship("Comment", back_populates="video", cascade="all, delete-orphan")
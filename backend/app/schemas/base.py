@@ -0,0 +1,17 @@
+from typing import Any
+
+
+class FastORMMixin:
+    """Build a response model from a trusted ORM row without validation
+
+    Only for models with no validators or nested models: the row's values
+    are copied as-is via ``model_construct``.
+    """
+
+    @classmethod
+    def from_orm_fast(cls, obj: Any):
+        return cls.model_construct(**{
+            name: getattr(obj, name)
+            for name in cls.model_fields
+            if hasattr(obj, name)
+        })
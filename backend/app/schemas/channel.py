@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 
@@ -33,9 +33,12 @@ class ChannelResponse(ChannelBase):
     avatar_local_path: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    # Cache-busting tokens for the /banner and /avatar image URLs; filled in
+    # by the handlers, which stat the files off the event loop
+    banner_version: Optional[str] = None
+    avatar_version: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class ChannelConfig(BaseModel):
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing import Dict, Optional, List
 from datetime import datetime
 
 
@@ -21,16 +21,25 @@ class CommentCreate(CommentBase):
     is_top_level: bool = True
 
 
-class CommentResponse(CommentBase):
+# Response models declare their fields directly rather than extending the
+# Base/Create chain, so each builds from a single class body
+class CommentResponse(BaseModel):
     id: int
+    youtube_comment_id: str
     video_id: int
     parent_comment_id: Optional[int] = None
+    author_name: Optional[str] = None
+    author_channel_id: Optional[str] = None
+    author_profile_image_url: Optional[str] = None
+    text_original: str
+    text_display: Optional[str] = None
+    like_count: int = 0
+    reply_count: int = 0
+    published_at: Optional[datetime] = None
     is_top_level: bool
     created_at: datetime
-    replies: List["CommentResponse"] = []
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class CommentListResponse(BaseModel):
@@ -39,3 +48,10 @@ class CommentListResponse(BaseModel):
     page: int
     per_page: int
     total_pages: int
+    # Initial replies for the comments above, flat, plus parent id -> reply ids
+    replies: List[CommentResponse] = []
+    replies_index: Dict[str, List[int]] = {}
+
+
+# Built once at import; reused for every list response
+comment_list_adapter = TypeAdapter(List[CommentResponse])
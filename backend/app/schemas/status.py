@@ -1,18 +1,23 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from pydantic.dataclasses import dataclass
+from typing import Literal, NotRequired, Optional, List, TypedDict
 from datetime import datetime
 
 
-class StorageStats(BaseModel):
+# Status page records are rebuilt on every poll; slotted frozen dataclasses
+# keep that cheap
+@dataclass(slots=True, frozen=True)
+class StorageStats:
     total_videos: int
     downloaded_videos: int
     total_size_bytes: int
     total_size_formatted: str
 
 
-class SyncProgress(BaseModel):
+@dataclass(slots=True, frozen=True)
+class SyncProgress:
+    status: Literal['idle', 'syncing', 'downloading']
     job_id: Optional[int] = None
-    status: str  # 'idle', 'syncing', 'downloading'
     job_type: Optional[str] = None
     total_items: int = 0
     processed_items: int = 0
@@ -20,7 +25,8 @@ class SyncProgress(BaseModel):
     percent_complete: float = 0
 
 
-class OverallStatus(BaseModel):
+@dataclass(slots=True, frozen=True)
+class OverallStatus:
     sync_progress: SyncProgress
     storage: StorageStats
     last_sync: Optional[datetime] = None
@@ -29,6 +35,9 @@ class OverallStatus(BaseModel):
     errors_count: int = 0
 
 
+overall_status_adapter = TypeAdapter(OverallStatus)
+
+
 class ErrorLogResponse(BaseModel):
     id: int
     sync_job_id: Optional[int] = None
@@ -38,8 +47,7 @@ class ErrorLogResponse(BaseModel):
     error_message: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class ErrorLogListResponse(BaseModel):
@@ -49,31 +57,55 @@ class ErrorLogListResponse(BaseModel):
     per_page: int
 
 
-# WebSocket message types
-class WSMessage(BaseModel):
-    type: str  # 'sync_progress', 'download_progress', 'sync_completed', 'error', 'queue_update'
+# Every type the server sends over the WebSocket
+WSMessageType = Literal[
+    'connected', 'status', 'pong',
+    'sync_progress', 'download_progress',
+    'sync_completed', 'sync_cancelled', 'sync_error',
+]
+
+
+# WebSocket message types. Plain validated records rather than models:
+# slots and frozen keep them small and cheap to build per progress tick.
+@dataclass(slots=True, frozen=True)
+class WSMessage:
+    type: WSMessageType
     data: dict
 
 
-class WSSyncProgress(BaseModel):
+@dataclass(slots=True, frozen=True)
+class WSSyncProgress:
     job_id: int
     total: int
     processed: int
-    current_video: Optional[str] = None
     percent_complete: float
+    current_video: Optional[str] = None
 
 
-class WSDownloadProgress(BaseModel):
+@dataclass(slots=True, frozen=True)
+class WSDownloadProgress:
     video_id: int
     youtube_id: str
     title: str
     progress: float
+    status: str
     speed: Optional[str] = None
     eta: Optional[str] = None
+
+
+class WSDownloadProgressDict(TypedDict):
+    """download_progress message data as built on the internal (unvalidated) path"""
+    video_id: int
+    youtube_id: str
+    title: str
+    progress: float
+    speed: NotRequired[Optional[str]]
+    eta: NotRequired[Optional[str]]
     status: str
 
 
-class WSQueueUpdate(BaseModel):
+@dataclass(slots=True, frozen=True)
+class WSQueueUpdate:
     queue_length: int
     downloading: int
     current_download: Optional[str] = None
@@ -94,8 +126,7 @@ class DownloadQueueItemResponse(BaseModel):
     created_at: datetime
     started_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class DownloadQueueResponse(BaseModel):
@@ -1,12 +1,18 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing import Literal, Optional, List
 from datetime import datetime, time
 
+from app.schemas.base import FastORMMixin
+
+
+JobType = Literal['full', 'new_only', 'metadata', 'comments']
+TimeFilter = Literal['week', 'month', 'year', 'all']
+
 
 class SyncConfigBase(BaseModel):
     auto_sync_enabled: bool = False
     auto_sync_time: Optional[time] = None
-    auto_sync_type: str = "new_only"
+    auto_sync_type: Literal['new_only', 'full'] = "new_only"
     max_video_quality: str = "1080p"
     sync_comments: bool = True
 
@@ -15,22 +21,28 @@ class SyncConfigUpdate(SyncConfigBase):
     pass
 
 
-class SyncConfigResponse(SyncConfigBase):
+# Declared flat rather than extending SyncConfigBase, so the schema builds
+# from a single class body
+class SyncConfigResponse(BaseModel, FastORMMixin):
     id: int
+    auto_sync_enabled: bool = False
+    auto_sync_time: Optional[time] = None
+    auto_sync_type: Literal['new_only', 'full'] = "new_only"
+    max_video_quality: str = "1080p"
+    sync_comments: bool = True
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class SyncJobCreate(BaseModel):
-    job_type: str  # 'full', 'new_only', 'metadata', 'comments'
-    time_filter: Optional[str] = "all"  # 'week', 'month', 'year', 'all'
+    job_type: JobType
+    time_filter: Optional[TimeFilter] = "all"
     channel_id: int  # Required: which channel to sync
 
 
-class SyncJobResponse(BaseModel):
+class SyncJobResponse(BaseModel, FastORMMixin):
     id: int
     job_type: str
     status: str
@@ -44,8 +56,7 @@ class SyncJobResponse(BaseModel):
     error_message: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class SyncJobListResponse(BaseModel):
@@ -70,8 +81,7 @@ class DownloadQueueItemResponse(BaseModel):
     created_at: datetime
     started_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class DownloadQueueResponse(BaseModel):
@@ -91,5 +101,8 @@ class SyncHistoryResponse(BaseModel):
     duration_seconds: Optional[int] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
+
+# Built once at import; reused for every list response
+sync_job_list_adapter = TypeAdapter(List[SyncJobResponse])
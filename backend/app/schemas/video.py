@@ -1,7 +1,9 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing import Literal, Optional, List
 from datetime import datetime
 
+from app.schemas.base import FastORMMixin
+
 
 class VideoBase(BaseModel):
     youtube_video_id: str
@@ -27,9 +29,19 @@ class VideoUpdate(BaseModel):
     is_available: Optional[bool] = None
 
 
-class VideoResponse(VideoBase):
+# Declared flat rather than extending VideoBase, so the schema builds from
+# a single class body
+class VideoResponse(BaseModel, FastORMMixin):
     id: int
+    youtube_video_id: str
     channel_id: Optional[int] = None
+    title: str
+    description: Optional[str] = None
+    upload_date: Optional[datetime] = None
+    duration: Optional[int] = None
+    view_count: Optional[int] = None
+    like_count: Optional[int] = None
+    comment_count: Optional[int] = None
     thumbnail_url: Optional[str] = None
     thumbnail_local_path: Optional[str] = None
     video_local_path: Optional[str] = None
@@ -43,8 +55,7 @@ class VideoResponse(VideoBase):
     updated_at: datetime
     downloaded_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class VideoListResponse(BaseModel):
@@ -57,8 +68,12 @@ class VideoListResponse(BaseModel):
 
 class VideoSearchParams(BaseModel):
     search: Optional[str] = None
-    sort_by: str = "upload_date"
-    sort_order: str = "desc"
+    sort_by: Literal['upload_date', 'title', 'view_count', 'duration'] = "upload_date"
+    sort_order: Literal['asc', 'desc'] = "desc"
     downloaded_only: bool = False
     date_from: Optional[datetime] = None
     date_to: Optional[datetime] = None
+
+
+# Built once at import; reused for every list response
+video_list_adapter = TypeAdapter(List[VideoResponse])
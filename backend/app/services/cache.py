@@ -0,0 +1,105 @@
+import fnmatch
+import functools
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Cache-aside store for serialized JSON responses.
+
+    Uses Redis when ``settings.redis_url`` is configured so every backend
+    replica shares entries, otherwise a per-process dict.
+    """
+
+    def __init__(self):
+        self._redis = None
+        self._local: Dict[str, Tuple[float, bytes]] = {}
+
+    @property
+    def redis(self):
+        """Shared Redis client, or None when running without Redis"""
+        return self._redis
+
+    async def connect(self):
+        if settings.redis_url:
+            import redis.asyncio as redis
+
+            pool = redis.ConnectionPool.from_url(settings.redis_url, max_connections=20)
+            self._redis = redis.Redis(connection_pool=pool)
+            logger.info("Response cache connected to Redis")
+
+    async def disconnect(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        self._local.clear()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if self._redis is not None:
+            try:
+                return await self._redis.get(key)
+            except Exception as e:
+                logger.warning(f"Cache get failed for {key}: {e}")
+                return None
+
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._local.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, expire: int):
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, value, ex=expire)
+            except Exception as e:
+                logger.warning(f"Cache set failed for {key}: {e}")
+            return
+
+        self._local[key] = (time.monotonic() + expire, value)
+
+    async def delete_pattern(self, pattern: str):
+        if self._redis is not None:
+            try:
+                keys = [key async for key in self._redis.scan_iter(match=pattern)]
+                if keys:
+                    await self._redis.delete(*keys)
+            except Exception as e:
+                logger.warning(f"Cache invalidation failed for {pattern}: {e}")
+            return
+
+        for key in fnmatch.filter(list(self._local), pattern):
+            self._local.pop(key, None)
+
+
+cache = ResponseCache()
+
+
+def cached(prefix: str, expire: int):
+    """Cache a parameterless GET endpoint's JSON body under ``prefix``"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            body = await cache.get(prefix)
+            if body is None:
+                result = await func(*args, **kwargs)
+                if isinstance(result, BaseModel):
+                    body = result.model_dump_json().encode()
+                else:
+                    body = orjson.dumps(result)
+                await cache.set(prefix, body, expire)
+            return Response(content=body, media_type="application/json")
+        return wrapper
+    return decorator
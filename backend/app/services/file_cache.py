@@ -0,0 +1,91 @@
+import asyncio
+import os
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from app.config import settings
+
+STAT_CACHE_SECONDS = 5
+STAT_CACHE_SIZE = 4096
+DISK_USAGE_CACHE_SECONDS = 10
+
+
+class FileStat(NamedTuple):
+    exists: bool
+    size: int
+    mtime_ns: int
+
+    @property
+    def version(self) -> str:
+        """Short token that changes whenever the file is replaced"""
+        return f"{self.mtime_ns:x}"
+
+
+_stats: Dict[str, Tuple[float, FileStat]] = {}
+_disk_usage: Dict[str, Tuple[float, Tuple[int, int]]] = {}
+
+
+def _stat(path: str) -> FileStat:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return FileStat(False, 0, 0)
+    return FileStat(True, st.st_size, st.st_mtime_ns)
+
+
+def _cached_stat(path: str) -> Optional[FileStat]:
+    entry = _stats.get(path)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _remember_stat(path: str, stat: FileStat) -> FileStat:
+    if path not in _stats and len(_stats) >= STAT_CACHE_SIZE:
+        # Evict the oldest entry
+        _stats.pop(next(iter(_stats)))
+    _stats[path] = (time.monotonic() + STAT_CACHE_SECONDS, stat)
+    return stat
+
+
+async def file_stat_async(path: str) -> FileStat:
+    """Stat a path on a worker thread, reusing the result for up to STAT_CACHE_SECONDS"""
+    cached = _cached_stat(path)
+    if cached is not None:
+        return cached
+    return _remember_stat(path, await asyncio.to_thread(_stat, path))
+
+
+def _statvfs_usage(path: str) -> Tuple[int, int]:
+    if not os.path.exists(path):
+        return 0, 0
+    stat = os.statvfs(path)
+    return stat.f_blocks * stat.f_frsize, stat.f_bavail * stat.f_frsize
+
+
+async def disk_usage(path: str) -> Tuple[int, int]:
+    """(total, free) bytes for the filesystem holding path, cached briefly"""
+    entry = _disk_usage.get(path)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    usage = await asyncio.to_thread(_statvfs_usage, path)
+    _disk_usage[path] = (time.monotonic() + DISK_USAGE_CACHE_SECONDS, usage)
+    return usage
+
+
+async def find_channel_image(
+    channel_id: int,
+    local_path: Optional[str],
+    kind: str
+) -> Optional[Tuple[str, FileStat]]:
+    """Locate a channel's banner/avatar file, preferring its recorded local path"""
+    if local_path:
+        stat = await file_stat_async(local_path)
+        if stat.exists:
+            return local_path, stat
+
+    path = os.path.join(settings.channel_path, f"{channel_id}_{kind}.jpg")
+    stat = await file_stat_async(path)
+    if stat.exists:
+        return path, stat
+    return None
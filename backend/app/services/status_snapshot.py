@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select, func
+
+from app.db.database import ReadSessionLocal
+from app.models.video import Video
+from app.models.sync import SyncJob, DownloadQueue, ErrorLog
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL_SECONDS = 2
+
+
+class StatusCounters(NamedTuple):
+    total_videos: int
+    downloaded_videos: int
+    total_size: int
+    last_sync: Optional[datetime]
+    queue_length: int
+    errors_count: int
+
+
+class StatusSnapshot:
+    """Database counters for the status page, refreshed on a fixed interval
+
+    Polling clients read the latest snapshot instead of each running the
+    aggregate queries, so database load stays constant as clients grow.
+    """
+
+    def __init__(self, interval: float = REFRESH_INTERVAL_SECONDS):
+        self.interval = interval
+        self._counters: Optional[StatusCounters] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background refresher"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresher())
+
+    async def stop(self):
+        """Stop the background refresher"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def current(self) -> StatusCounters:
+        """Latest counters, loading them on first use"""
+        if self._counters is None:
+            await self.refresh()
+        return self._counters
+
+    async def refresh(self):
+        """Recompute the counters from the database"""
+        async with ReadSessionLocal() as db:
+            # Storage stats; FILTER clauses compute all three in one scan
+            downloaded = Video.is_downloaded == True
+            storage_result = await db.execute(
+                select(
+                    func.count(Video.id),
+                    func.count(Video.id).filter(downloaded),
+                    func.coalesce(func.sum(Video.video_size_bytes).filter(downloaded), 0)
+                )
+            )
+            total_videos, downloaded_videos, total_size = storage_result.one()
+
+            # Last sync time, queue length and recent errors count in one round-trip
+            counters_result = await db.execute(
+                select(
+                    select(SyncJob.completed_at)
+                    .where(SyncJob.status == "completed")
+                    .order_by(SyncJob.completed_at.desc())
+                    .limit(1)
+                    .scalar_subquery(),
+                    select(func.count(DownloadQueue.id))
+                    .where(DownloadQueue.status.in_(["queued", "downloading"]))
+                    .scalar_subquery(),
+                    select(func.count(ErrorLog.id)).scalar_subquery()
+                )
+            )
+            last_sync, queue_length, errors_count = counters_result.one()
+
+        self._counters = StatusCounters(
+            total_videos=total_videos,
+            downloaded_videos=downloaded_videos,
+            total_size=total_size or 0,
+            last_sync=last_sync,
+            queue_length=queue_length,
+            errors_count=errors_count
+        )
+
+    async def _refresher(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Status snapshot refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+status_snapshot = StatusSnapshot()
@@ -1,86 +1,151 @@
 import yt_dlp
+import aiofiles
 import asyncio
+import httpx
 import os
 import logging
-from typing import Optional, Callable, Dict, Any
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, NotRequired, Optional, TypedDict
 from pathlib import Path
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Download progress is reported at most every PROGRESS_MIN_INTERVAL seconds
+# unless it has advanced by at least PROGRESS_MIN_DELTA percent
+PROGRESS_MIN_INTERVAL = 0.25
+PROGRESS_MIN_DELTA = 1.0
 
-class VideoDownloader:
-    def __init__(
-        self,
-        storage_path: Optional[str] = None,
-        max_quality: str = "1080"
-    ):
-        self.storage_path = Path(storage_path or settings.videos_path)
-        self.max_quality = max_quality.replace("p", "")
-        self.progress_callback: Optional[Callable] = None
-        self.current_video_id: Optional[str] = None
-        self._loop: Optional[asyncio.AbstractEventLoop] = None
+# Output file extensions in order of preference
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.webm')
+THUMBNAIL_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
 
-    def _progress_hook(self, d: Dict[str, Any]):
-        """yt-dlp progress callback"""
-        if d['status'] == 'downloading':
-            progress_data = {
-                'status': 'downloading',
-                'video_id': self.current_video_id,
-                'progress': 0,
-                'speed': d.get('_speed_str', 'N/A'),
-                'eta': d.get('_eta_str', 'N/A'),
-                'downloaded_bytes': d.get('downloaded_bytes', 0),
-                'total_bytes': d.get('total_bytes') or d.get('total_bytes_estimate', 0),
-            }
+THUMBNAIL_CHUNK_SIZE = 64 * 1024
 
-            # Calculate progress percentage
-            if progress_data['total_bytes'] > 0:
-                progress_data['progress'] = (
-                    progress_data['downloaded_bytes'] / progress_data['total_bytes']
-                ) * 100
-
-            if self.progress_callback and self._loop:
-                self._loop.call_soon_threadsafe(
-                    lambda pd=progress_data: asyncio.run_coroutine_threadsafe(
-                        self.progress_callback(pd), self._loop
-                    )
-                )
 
-        elif d['status'] == 'finished':
-            if self.progress_callback and self._loop:
-                self._loop.call_soon_threadsafe(
-                    lambda: asyncio.run_coroutine_threadsafe(
-                        self.progress_callback({
-                            'status': 'processing',
-                            'video_id': self.current_video_id,
-                            'progress': 100,
-                        }), self._loop
-                    )
-                )
+class ProgressUpdate(TypedDict):
+    """Payload passed to download progress callbacks"""
+    status: str  # 'downloading', 'processing'
+    video_id: str  # YouTube video ID
+    progress: float
+    speed: NotRequired[str]
+    eta: NotRequired[str]
+    downloaded_bytes: NotRequired[int]
+    total_bytes: NotRequired[int]
 
-    async def download_video(
+
+# Invoked on the event loop thread; must not block
+ProgressCallback = Callable[[ProgressUpdate], None]
+
+
+class _DownloadHook:
+    """yt-dlp progress hook holding one download's state
+
+    Each download gets its own, so a cancelled download whose thread is still
+    winding down can't report under, or stop honoring cancellation of, the next.
+    """
+
+    def __init__(
         self,
         video_id: str,
-        progress_callback: Optional[Callable] = None
-    ) -> Dict[str, Any]:
-        """Download a single video by YouTube video ID"""
-        self.progress_callback = progress_callback
-        self.current_video_id = video_id
-        self._loop = asyncio.get_running_loop()
+        loop: asyncio.AbstractEventLoop,
+        callback: Optional[ProgressCallback],
+        should_stop: Optional[Callable[[], bool]]
+    ):
+        self.video_id = video_id
+        self.loop = loop
+        self.callback = callback
+        self.should_stop = should_stop
+        # Set once the awaiting coroutine is cancelled
+        self.cancelled = False
+        self._buf: ProgressUpdate = {'status': 'downloading', 'video_id': video_id, 'progress': 0}
+        self._last_emit_ts = 0.0
+        self._last_progress = -1.0
+        self._last_downloaded = 0
+        self._total_bytes = 0
+
+    def __call__(self, d: Dict[str, Any]):
+        # Raising here is how yt-dlp lets a hook abort the download thread
+        if self.cancelled or (self.should_stop is not None and self.should_stop()):
+            raise yt_dlp.utils.DownloadCancelled()
 
-        output_dir = self.storage_path / video_id
-        output_dir.mkdir(parents=True, exist_ok=True)
+        if d['status'] == 'downloading':
+            downloaded_bytes = d.get('downloaded_bytes') or 0
+            if downloaded_bytes == self._last_downloaded:
+                return
+            if downloaded_bytes < self._last_downloaded:
+                # yt-dlp moved on to the next stream (e.g. audio after video)
+                self._total_bytes = 0
+            self._last_downloaded = downloaded_bytes
+
+            # An exact total is fixed for the stream; estimates are re-read each tick
+            total_bytes = self._total_bytes
+            if not total_bytes:
+                total_bytes = d.get('total_bytes') or 0
+                if total_bytes:
+                    self._total_bytes = total_bytes
+                else:
+                    total_bytes = d.get('total_bytes_estimate') or 0
+            progress = downloaded_bytes * 100 / total_bytes if total_bytes else 0
+
+            # Only report when enough time has passed or progress moved noticeably
+            now = time.monotonic()
+            if (
+                now - self._last_emit_ts < PROGRESS_MIN_INTERVAL
+                and abs(progress - self._last_progress) < PROGRESS_MIN_DELTA
+            ):
+                return
+            self._last_emit_ts = now
+            self._last_progress = progress
+
+            # Update the reusable buffer in place, reading the display strings
+            # only for ticks that are actually reported
+            progress_data = self._buf
+            progress_data['progress'] = progress
+            progress_data['speed'] = d.get('_speed_str') or 'N/A'
+            progress_data['eta'] = d.get('_eta_str') or 'N/A'
+            progress_data['downloaded_bytes'] = downloaded_bytes
+            progress_data['total_bytes'] = total_bytes
+
+            if self.callback:
+                # Hand the snapshot to the loop without a coroutine/Future per tick
+                self.loop.call_soon_threadsafe(self.callback, progress_data.copy())
 
-        video_path = output_dir / "video.mp4"
-        thumbnail_path = output_dir / "thumbnail.jpg"
+        elif d['status'] == 'finished':
+            if self.callback:
+                self.loop.call_soon_threadsafe(self.callback, {
+                    'status': 'processing',
+                    'video_id': self.video_id,
+                    'progress': 100,
+                })
 
-        ydl_opts = {
-            'format': f'bestvideo[height<={self.max_quality}]+bestaudio/best[height<={self.max_quality}]',
-            'outtmpl': str(output_dir / 'video.%(ext)s'),
+
+class VideoDownloader:
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        max_quality: str = "1080"
+    ):
+        self.storage_path = Path(storage_path or settings.videos_path)
+        # String form for the path helpers, which skip Path allocation
+        self._storage_str = str(self.storage_path)
+        self.max_quality = max_quality.replace("p", "")
+        self._format_str = f'bestvideo[height<={self.max_quality}]+bestaudio/best[height<={self.max_quality}]'
+        self._http_client: Optional[httpx.AsyncClient] = None
+        # yt-dlp gets its own bounded pool so long downloads can't exhaust the
+        # default executor used for file and API calls
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.max_concurrent_downloads,
+            thread_name_prefix="yt-dlp"
+        )
+
+        # Static yt-dlp options; download_video only adds the per-video fields
+        self._ydl_opts_template = {
+            'format': self._format_str,
             'writethumbnail': True,
-            'progress_hooks': [self._progress_hook],
             'merge_output_format': 'mp4',
             'postprocessors': [
                 {
@@ -97,48 +162,78 @@ class VideoDownloader:
             'extract_flat': False,
         }
 
+    async def download_video(
+        self,
+        video_id: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> Dict[str, Any]:
+        """Download a single video by YouTube video ID"""
+        loop = asyncio.get_running_loop()
+        hook = _DownloadHook(video_id, loop, progress_callback, should_stop)
+
+        output_dir = self.storage_path / video_id
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        video_path = output_dir / "video.mp4"
+        thumbnail_path = output_dir / "thumbnail.jpg"
+
+        ydl_opts = {
+            **self._ydl_opts_template,
+            'outtmpl': str(output_dir / 'video.%(ext)s'),
+            'progress_hooks': [hook],
+        }
+
         url = f"https://www.youtube.com/watch?v={video_id}"
 
         try:
-            info = await self._loop.run_in_executor(
-                None,
-                lambda: self._download_sync(url, ydl_opts)
+            try:
+                info = await loop.run_in_executor(
+                    self._executor,
+                    self._download_sync,
+                    url,
+                    ydl_opts
+                )
+            except asyncio.CancelledError:
+                # The worker thread keeps running; make its next hook call abort it
+                hook.cancelled = True
+                raise
+
+            # Classify everything yt-dlp left behind in a single directory scan.
+            # The video may still have a pre-conversion extension.
+            named_videos = {}
+            other_videos = []
+            thumbnail = None
+            thumbnail_rank = None
+            with os.scandir(output_dir) as entries:
+                for entry in entries:
+                    stem, ext = os.path.splitext(entry.name)
+                    if ext in VIDEO_EXTENSIONS:
+                        if stem == 'video':
+                            named_videos[ext] = entry
+                        else:
+                            other_videos.append(entry)
+                    elif ext in THUMBNAIL_EXTENSIONS:
+                        # Prefer by extension, then video.* over thumbnail.* over anything else
+                        rank = (
+                            THUMBNAIL_EXTENSIONS.index(ext),
+                            0 if stem == 'video' else 1 if stem == 'thumbnail' else 2,
+                        )
+                        if thumbnail_rank is None or rank < thumbnail_rank:
+                            thumbnail, thumbnail_rank = entry, rank
+
+            video_entry = next(
+                (named_videos[ext] for ext in VIDEO_EXTENSIONS if ext in named_videos),
+                other_videos[0] if other_videos else None
             )
+            file_size = 0
+            if video_entry is not None:
+                file_size = video_entry.stat().st_size
+                if video_entry.name != 'video.mp4':
+                    os.rename(video_entry.path, video_path)
 
-            # Find the actual video file (might have different extension before conversion)
-            actual_video_path = None
-            for ext in ['mp4', 'mkv', 'webm']:
-                check_path = output_dir / f"video.{ext}"
-                if check_path.exists():
-                    if ext != 'mp4':
-                        check_path.rename(video_path)
-                    actual_video_path = video_path
-                    break
-
-            if not actual_video_path or not actual_video_path.exists():
-                # Try to find any video file
-                for f in output_dir.iterdir():
-                    if f.suffix in ['.mp4', '.mkv', '.webm']:
-                        f.rename(video_path)
-                        actual_video_path = video_path
-                        break
-
-            # Find thumbnail
-            actual_thumbnail_path = None
-            for ext in ['jpg', 'jpeg', 'png', 'webp']:
-                for pattern in [f"video.{ext}", f"thumbnail.{ext}", f"*.{ext}"]:
-                    for f in output_dir.glob(pattern):
-                        if f.name != "video.mp4":
-                            if f.name != "thumbnail.jpg":
-                                f.rename(thumbnail_path)
-                            actual_thumbnail_path = thumbnail_path
-                            break
-                    if actual_thumbnail_path:
-                        break
-                if actual_thumbnail_path:
-                    break
-
-            file_size = video_path.stat().st_size if video_path.exists() else 0
+            if thumbnail is not None and thumbnail.name != 'thumbnail.jpg':
+                os.rename(thumbnail.path, thumbnail_path)
 
             # Determine actual quality
             quality = "unknown"
@@ -152,8 +247,8 @@ class VideoDownloader:
 
             return {
                 'success': True,
-                'video_path': str(video_path) if video_path.exists() else None,
-                'thumbnail_path': str(thumbnail_path) if thumbnail_path.exists() else None,
+                'video_path': str(video_path) if video_entry is not None else None,
+                'thumbnail_path': str(thumbnail_path) if thumbnail is not None else None,
                 'file_size': file_size,
                 'quality': quality,
             }
@@ -175,25 +270,40 @@ class VideoDownloader:
 
     async def download_thumbnail(self, video_id: str, thumbnail_url: str) -> Optional[str]:
         """Download just the thumbnail for a video"""
-        import httpx
-
         output_dir = self.storage_path / video_id
         output_dir.mkdir(parents=True, exist_ok=True)
         thumbnail_path = output_dir / "thumbnail.jpg"
+        partial_path = output_dir / "thumbnail.jpg.part"
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(thumbnail_url)
+            # Stream to disk so the body is never held in memory whole
+            async with self._get_http_client().stream("GET", thumbnail_url) as response:
                 response.raise_for_status()
-
-                with open(thumbnail_path, 'wb') as f:
-                    f.write(response.content)
-
-                return str(thumbnail_path)
+                async with aiofiles.open(partial_path, 'wb') as f:
+                    async for chunk in response.aiter_bytes(THUMBNAIL_CHUNK_SIZE):
+                        await f.write(chunk)
+            os.replace(partial_path, thumbnail_path)
+            return str(thumbnail_path)
         except Exception as e:
             logger.error(f"Error downloading thumbnail for {video_id}: {e}")
             return None
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Shared client so thumbnail fetches reuse connections"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=20),
+                follow_redirects=True
+            )
+        return self._http_client
+
+    async def close(self):
+        """Close the shared HTTP client and the download pool"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
     async def check_video_available(self, video_id: str) -> bool:
         """Check if a video is still available on YouTube"""
         ydl_opts = {
@@ -207,8 +317,10 @@ class VideoDownloader:
         try:
             loop = asyncio.get_running_loop()
             info = await loop.run_in_executor(
-                None,
-                lambda: self._extract_info_sync(url, ydl_opts)
+                self._executor,
+                self._extract_info_sync,
+                url,
+                ydl_opts
             )
             return info is not None
         except Exception:
@@ -222,24 +334,27 @@ class VideoDownloader:
         except Exception:
             return None
 
-    def get_video_path(self, video_id: str) -> Optional[Path]:
-        """Get the path to a downloaded video"""
-        video_path = self.storage_path / video_id / "video.mp4"
-        return video_path if video_path.exists() else None
-
-    def get_thumbnail_path(self, video_id: str) -> Optional[Path]:
-        """Get the path to a video's thumbnail"""
-        thumbnail_path = self.storage_path / video_id / "thumbnail.jpg"
-        return thumbnail_path if thumbnail_path.exists() else None
+    def thumbnail_path(self, video_id: str) -> str:
+        """Where a video's thumbnail is stored; callers check it exists"""
+        return os.path.join(self._storage_str, video_id, "thumbnail.jpg")
 
     def delete_video(self, video_id: str) -> bool:
         """Delete a downloaded video and its files"""
-        video_dir = self.storage_path / video_id
-        if video_dir.exists():
-            import shutil
+        video_dir = os.path.join(self._storage_str, video_id)
+        try:
+            names = os.listdir(video_dir)
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+
+        # The directory is normally flat (video, thumbnail, maybe a leftover .part)
+        try:
+            for name in names:
+                os.unlink(os.path.join(video_dir, name))
+            os.rmdir(video_dir)
+        except OSError:
+            # Something nested in there; fall back to a full recursive delete
             shutil.rmtree(video_dir)
-            return True
-        return False
+        return True
 
 
 video_downloader = VideoDownloader()
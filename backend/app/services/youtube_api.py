@@ -1,19 +1,140 @@
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import asyncio
+import httpx
 import logging
+import orjson
+import re
+import time
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3"
+YOUTUBE_KEEPALIVE_SECONDS = 120
+
+# videos.list accepts at most this many IDs per call
+VIDEO_DETAILS_BATCH_SIZE = 50
+# Concurrent videos.list calls, kept low to avoid quota burst rejections
+VIDEO_DETAILS_CONCURRENCY = 8
+
+# Channel metadata and video statistics change slowly next to sync cadence,
+# so recent API results are reused instead of spending quota again
+# (lifetimes come from settings)
+API_CACHE_SIZE = 8192
+
+# Shared read-only default for missing nested objects in API responses
+_EMPTY: Dict[str, Any] = {}
+
+# Python 3.11's fromisoformat accepts the API's trailing "Z" directly
+_parse_iso = datetime.fromisoformat
+
+# ISO 8601 video durations such as PT1H2M3S
+_DURATION_RE = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
+
+
+@dataclass(slots=True)
+class CommentRecord:
+    """A decoded comment; syncs build thousands of these, so they carry no __dict__"""
+    youtube_comment_id: str
+    author_name: str
+    author_channel_id: str
+    author_profile_image_url: str
+    text_original: str
+    text_display: str
+    like_count: int
+    reply_count: int
+    published_at: Optional[datetime]
+    is_top_level: bool
+    updated_at: Optional[datetime] = None
+    replies: List["CommentRecord"] = field(default_factory=list)
+
+
+class YouTubeAPIError(Exception):
+    """Error response from the YouTube Data API"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"YouTube API {status}: {message}")
+        self.status = status
+
+
+class _RateLimiter:
+    """Spaces request starts evenly so sustained traffic stays under a QPS cap"""
+
+    def __init__(self, rate: float):
+        self._interval = 1 / rate if rate > 0 else 0
+        self._next_slot = 0.0
+
+    async def __aenter__(self):
+        if not self._interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+def _cache_get(cache: Dict[str, Tuple[float, Any]], key: str) -> Optional[Any]:
+    entry = cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _cache_put(cache: Dict[str, Tuple[float, Any]], key: str, value: Any, ttl: float):
+    if key not in cache and len(cache) >= API_CACHE_SIZE:
+        # Evict the oldest entry
+        cache.pop(next(iter(cache)))
+    cache[key] = (time.monotonic() + ttl, value)
+
+
+def _friendly_error(e: YouTubeAPIError) -> ValueError:
+    """Translate common API errors into messages worth showing the user"""
+    error_msg = str(e)
+    if "accessNotConfigured" in error_msg or "has not been used" in error_msg:
+        return ValueError("YouTube Data API v3 is not enabled. Please enable it in Google Cloud Console.")
+    elif "API key not valid" in error_msg:
+        return ValueError("Invalid YouTube API key. Please check your API key.")
+    elif "quotaExceeded" in error_msg:
+        return ValueError("YouTube API quota exceeded. Please try again later.")
+    return ValueError(f"YouTube API error: {error_msg}")
+
+
+def _shape_channel_item(item: Dict[str, Any], channel_id: str) -> Dict[str, Any]:
+    """Channel dict built from a channels.list item"""
+    snippet = item.get("snippet", {})
+    stats = item.get("statistics", {})
+    branding = item.get("brandingSettings", {})
+
+    return {
+        "youtube_channel_id": channel_id,
+        "title": snippet.get("title", ""),
+        "description": snippet.get("description", ""),
+        "custom_url": snippet.get("customUrl", ""),
+        "subscriber_count": int(stats.get("subscriberCount", 0)),
+        "video_count": int(stats.get("videoCount", 0)),
+        "view_count": int(stats.get("viewCount", 0)),
+        "avatar_url": snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
+        "banner_url": branding.get("image", {}).get("bannerExternalUrl", ""),
+    }
+
 
 class YouTubeAPIService:
     def __init__(self, api_key: Optional[str] = None):
         self._api_key = api_key or settings.youtube_api_key
-        self._youtube = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._uploads_playlists: Dict[str, str] = {}
+        self._details_semaphore = asyncio.Semaphore(VIDEO_DETAILS_CONCURRENCY)
+        self._request_semaphore = asyncio.Semaphore(settings.youtube_concurrency)
+        self._rate_limiter = _RateLimiter(settings.youtube_qps)
+        self._channel_info_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._video_details_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
 
     @property
     def api_key(self):
@@ -21,102 +142,173 @@ class YouTubeAPIService:
 
     @api_key.setter
     def api_key(self, value: str):
-        if value != self._api_key:
-            self._api_key = value
-            self._youtube = None  # Reset client to force rebuild with new key
+        # The key is sent per request, so the client can be kept
+        self._api_key = value
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared client so every API call reuses pooled connections"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=YOUTUBE_API_URL,
+                timeout=30,
+                # Sync runs call the API between long downloads; keep idle
+                # connections around so those calls skip a fresh TLS handshake
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=50,
+                    keepalive_expiry=YOUTUBE_KEEPALIVE_SECONDS
+                )
+            )
+        return self._client
 
-    @property
-    def youtube(self):
-        if self._youtube is None and self._api_key:
-            self._youtube = build("youtube", "v3", developerKey=self._api_key)
-        return self._youtube
-
-    async def _run_sync(self, func):
-        """Run synchronous API call in executor"""
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, func)
-
-    async def get_channel_info(self, channel_id: str) -> Optional[Dict[str, Any]]:
-        """Fetch channel information by channel ID"""
-        if not self.youtube:
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get(self, resource: str, **params) -> Dict[str, Any]:
+        """GET a Data API resource and return the decoded JSON body"""
+        if not self._api_key:
             raise ValueError("YouTube API key not configured")
 
-        def fetch():
-            request = self.youtube.channels().list(
+        params["key"] = self._api_key
+        async with self._request_semaphore, self._rate_limiter:
+            response = await self._get_client().get(f"/{resource}", params=params)
+        if response.is_error:
+            try:
+                error = orjson.loads(response.content).get("error", {})
+                reasons = ", ".join(
+                    err.get("reason", "") for err in error.get("errors", [])
+                )
+                message = f"{error.get('message', response.reason_phrase)} ({reasons})"
+            except (orjson.JSONDecodeError, AttributeError):
+                message = response.reason_phrase
+            raise YouTubeAPIError(response.status_code, message)
+        # Comment threads and video batches are large; orjson decodes them far faster
+        return orjson.loads(response.content)
+
+    async def get_channel_info(
+        self,
+        channel_id: str,
+        use_cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch channel information by channel ID; use_cache=False always asks YouTube"""
+        if use_cache:
+            cached = _cache_get(self._channel_info_cache, channel_id)
+            if cached is not None:
+                return dict(cached)
+
+        try:
+            response = await self._get(
+                "channels",
                 part="snippet,statistics,brandingSettings",
                 id=channel_id
             )
-            return request.execute()
-
-        try:
-            response = await self._run_sync(fetch)
             if not response.get("items"):
                 return None
 
-            item = response["items"][0]
-            snippet = item.get("snippet", {})
-            stats = item.get("statistics", {})
-            branding = item.get("brandingSettings", {})
-
-            return {
-                "youtube_channel_id": channel_id,
-                "title": snippet.get("title", ""),
-                "description": snippet.get("description", ""),
-                "custom_url": snippet.get("customUrl", ""),
-                "subscriber_count": int(stats.get("subscriberCount", 0)),
-                "video_count": int(stats.get("videoCount", 0)),
-                "view_count": int(stats.get("viewCount", 0)),
-                "avatar_url": snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
-                "banner_url": branding.get("image", {}).get("bannerExternalUrl", ""),
-            }
-        except HttpError as e:
+            info = _shape_channel_item(response["items"][0], channel_id)
+            _cache_put(self._channel_info_cache, channel_id, info, settings.youtube_channel_cache_seconds)
+            return dict(info)
+        except YouTubeAPIError as e:
             logger.error(f"YouTube API error fetching channel: {e}")
-            # Extract meaningful error message
-            error_msg = str(e)
-            if "accessNotConfigured" in error_msg or "has not been used" in error_msg:
-                raise ValueError("YouTube Data API v3 is not enabled. Please enable it in Google Cloud Console.")
-            elif "API key not valid" in error_msg:
-                raise ValueError("Invalid YouTube API key. Please check your API key.")
-            elif "quotaExceeded" in error_msg:
-                raise ValueError("YouTube API quota exceeded. Please try again later.")
-            raise ValueError(f"YouTube API error: {error_msg}")
+            raise _friendly_error(e)
 
     async def get_channel_by_username(self, username: str) -> Optional[Dict[str, Any]]:
         """Fetch channel information by username or handle"""
-        if not self.youtube:
-            raise ValueError("YouTube API key not configured")
-
-        def fetch():
+        try:
             # Try forHandle first (for @username)
             if username.startswith("@"):
-                request = self.youtube.channels().list(
+                response = await self._get(
+                    "channels",
                     part="snippet,statistics,brandingSettings",
                     forHandle=username[1:]
                 )
             else:
-                request = self.youtube.channels().list(
+                response = await self._get(
+                    "channels",
                     part="snippet,statistics,brandingSettings",
                     forUsername=username
                 )
-            return request.execute()
-
-        try:
-            response = await self._run_sync(fetch)
             if not response.get("items"):
                 return None
 
+            # The lookup already returned every part get_channel_info asks for
             item = response["items"][0]
-            return await self.get_channel_info(item["id"])
-        except HttpError as e:
+            info = _shape_channel_item(item, item["id"])
+            _cache_put(self._channel_info_cache, item["id"], info, settings.youtube_channel_cache_seconds)
+            return dict(info)
+        except YouTubeAPIError as e:
             logger.error(f"YouTube API error fetching channel by username: {e}")
-            error_msg = str(e)
-            if "accessNotConfigured" in error_msg or "has not been used" in error_msg:
-                raise ValueError("YouTube Data API v3 is not enabled. Please enable it in Google Cloud Console.")
-            elif "API key not valid" in error_msg:
-                raise ValueError("Invalid YouTube API key. Please check your API key.")
-            elif "quotaExceeded" in error_msg:
-                raise ValueError("YouTube API quota exceeded. Please try again later.")
-            raise ValueError(f"YouTube API error: {error_msg}")
+            raise _friendly_error(e)
+
+    async def _get_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
+        """Uploads playlist ID for a channel, looked up at most once per channel"""
+        # A UC... channel's uploads playlist is the same ID with a UU prefix
+        if channel_id.startswith("UC"):
+            return "UU" + channel_id[2:]
+
+        if channel_id not in self._uploads_playlists:
+            channel_response = await self._get(
+                "channels",
+                part="contentDetails",
+                id=channel_id
+            )
+            if not channel_response.get("items"):
+                return None
+            self._uploads_playlists[channel_id] = (
+                channel_response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+            )
+        return self._uploads_playlists[channel_id]
+
+    async def _get_playlist_page(
+        self,
+        playlist_id: str,
+        max_results: int = 50,
+        page_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Fetch one raw page of a playlist's items"""
+        request_params = {
+            "part": "snippet,contentDetails",
+            "playlistId": playlist_id,
+            "maxResults": min(max_results, 50),
+        }
+        if page_token:
+            request_params["pageToken"] = page_token
+        return await self._get("playlistItems", **request_params)
+
+    def _parse_playlist_items(
+        self,
+        response: Dict[str, Any],
+        published_after: Optional[datetime]
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Turn a playlistItems page into video dicts
+
+        Also reports whether the published_after cutoff was reached. Uploads
+        playlists are newest-first, so nothing after that point is wanted.
+        """
+        videos = []
+
+        for item in response.get("items", []):
+            snippet = item.get("snippet") or _EMPTY
+            published_at = _parse_iso(snippet.get("publishedAt", ""))
+
+            # Filter by published_after if specified
+            if published_after and published_at < published_after:
+                return videos, True
+
+            videos.append({
+                "youtube_video_id": (snippet.get("resourceId") or _EMPTY).get("videoId", ""),
+                "title": snippet.get("title", ""),
+                "description": snippet.get("description", ""),
+                "upload_date": published_at,
+                "thumbnail_url": (
+                    (snippet.get("thumbnails") or _EMPTY).get("high") or _EMPTY
+                ).get("url", ""),
+            })
+
+        return videos, False
 
     async def get_channel_videos(
         self,
@@ -126,102 +318,93 @@ class YouTubeAPIService:
         page_token: Optional[str] = None
     ) -> Dict[str, Any]:
         """Fetch videos from a channel's uploads playlist"""
-        if not self.youtube:
-            raise ValueError("YouTube API key not configured")
-
-        # First get the uploads playlist ID
-        def get_uploads_playlist():
-            request = self.youtube.channels().list(
-                part="contentDetails",
-                id=channel_id
-            )
-            return request.execute()
-
         try:
-            channel_response = await self._run_sync(get_uploads_playlist)
-            if not channel_response.get("items"):
+            uploads_playlist_id = await self._get_uploads_playlist_id(channel_id)
+            if not uploads_playlist_id:
                 return {"videos": [], "next_page_token": None}
 
-            uploads_playlist_id = channel_response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
-
-            # Now fetch videos from the uploads playlist
-            def fetch_videos():
-                request_params = {
-                    "part": "snippet,contentDetails",
-                    "playlistId": uploads_playlist_id,
-                    "maxResults": min(max_results, 50),
-                }
-                if page_token:
-                    request_params["pageToken"] = page_token
-
-                request = self.youtube.playlistItems().list(**request_params)
-                return request.execute()
-
-            response = await self._run_sync(fetch_videos)
-            videos = []
-
-            for item in response.get("items", []):
-                snippet = item.get("snippet", {})
-                published_at = datetime.fromisoformat(
-                    snippet.get("publishedAt", "").replace("Z", "+00:00")
-                )
-
-                # Filter by published_after if specified
-                if published_after and published_at < published_after:
-                    continue
-
-                videos.append({
-                    "youtube_video_id": snippet.get("resourceId", {}).get("videoId", ""),
-                    "title": snippet.get("title", ""),
-                    "description": snippet.get("description", ""),
-                    "upload_date": published_at,
-                    "thumbnail_url": snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
-                })
-
+            response = await self._get_playlist_page(uploads_playlist_id, max_results, page_token)
+            videos, reached_cutoff = self._parse_playlist_items(response, published_after)
             return {
                 "videos": videos,
-                "next_page_token": response.get("nextPageToken"),
+                "next_page_token": None if reached_cutoff else response.get("nextPageToken"),
             }
-        except HttpError as e:
+        except YouTubeAPIError as e:
+            logger.error(f"YouTube API error fetching videos: {e}")
+            raise
+
+    async def get_all_channel_videos(
+        self,
+        channel_id: str,
+        published_after: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch every video in a channel's uploads playlist published after the cutoff"""
+        try:
+            uploads_playlist_id = await self._get_uploads_playlist_id(channel_id)
+            if not uploads_playlist_id:
+                return []
+
+            videos = []
+            page_token = None
+            while True:
+                response = await self._get_playlist_page(uploads_playlist_id, page_token=page_token)
+                page_videos, reached_cutoff = self._parse_playlist_items(response, published_after)
+                videos.extend(page_videos)
+
+                # Stop at the first video older than the cutoff; later pages are older still
+                page_token = response.get("nextPageToken")
+                if reached_cutoff or not page_token:
+                    return videos
+        except YouTubeAPIError as e:
             logger.error(f"YouTube API error fetching videos: {e}")
             raise
 
     async def get_video_details(self, video_ids: List[str]) -> List[Dict[str, Any]]:
         """Fetch detailed information for specific videos"""
-        if not self.youtube:
-            raise ValueError("YouTube API key not configured")
-
         if not video_ids:
             return []
 
-        def fetch():
-            # API allows max 50 IDs per request
-            request = self.youtube.videos().list(
-                part="snippet,contentDetails,statistics",
-                id=",".join(video_ids[:50])
-            )
-            return request.execute()
+        # Only ask the API for videos without a recent cached result
+        found: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for video_id in video_ids:
+            cached = _cache_get(self._video_details_cache, video_id)
+            if cached is not None:
+                found[video_id] = cached
+            else:
+                missing.append(video_id)
+
+        # API allows max 50 IDs per request; fetch the chunks concurrently
+        chunks = [
+            missing[i:i + VIDEO_DETAILS_BATCH_SIZE]
+            for i in range(0, len(missing), VIDEO_DETAILS_BATCH_SIZE)
+        ]
+
+        async def fetch_chunk(ids: List[str]) -> Dict[str, Any]:
+            async with self._details_semaphore:
+                return await self._get(
+                    "videos",
+                    part="snippet,contentDetails,statistics",
+                    id=",".join(ids)
+                )
 
         try:
-            response = await self._run_sync(fetch)
-            videos = []
+            responses = await asyncio.gather(*(fetch_chunk(c) for c in chunks))
 
-            for item in response.get("items", []):
-                snippet = item.get("snippet", {})
-                stats = item.get("statistics", {})
-                content = item.get("contentDetails", {})
+            for item in (item for response in responses for item in response.get("items", [])):
+                snippet = item.get("snippet") or _EMPTY
+                stats = item.get("statistics") or _EMPTY
+                content = item.get("contentDetails") or _EMPTY
+                thumbnails = snippet.get("thumbnails") or _EMPTY
 
                 # Parse duration (ISO 8601 format like PT1H2M3S)
-                duration_str = content.get("duration", "PT0S")
-                duration = self._parse_duration(duration_str)
+                duration = self._parse_duration(content.get("duration", "PT0S"))
 
-                published_at = None
-                if snippet.get("publishedAt"):
-                    published_at = datetime.fromisoformat(
-                        snippet["publishedAt"].replace("Z", "+00:00")
-                    )
+                published_at = snippet.get("publishedAt")
+                if published_at:
+                    published_at = _parse_iso(published_at)
 
-                videos.append({
+                video = {
                     "youtube_video_id": item["id"],
                     "title": snippet.get("title", ""),
                     "description": snippet.get("description", ""),
@@ -230,14 +413,18 @@ class YouTubeAPIService:
                     "view_count": int(stats.get("viewCount", 0)),
                     "like_count": int(stats.get("likeCount", 0)),
                     "comment_count": int(stats.get("commentCount", 0)),
-                    "thumbnail_url": snippet.get("thumbnails", {}).get("maxres",
-                                     snippet.get("thumbnails", {}).get("high", {})).get("url", ""),
+                    "thumbnail_url": (
+                        thumbnails.get("maxres") or thumbnails.get("high") or _EMPTY
+                    ).get("url", ""),
                     "tags": snippet.get("tags", []),
                     "category": snippet.get("categoryId", ""),
-                })
+                }
+                _cache_put(self._video_details_cache, item["id"], video, settings.youtube_video_cache_seconds)
+                found[item["id"]] = video
 
-            return videos
-        except HttpError as e:
+            # Callers may update what they get back; hand out copies
+            return [dict(found[v]) for v in video_ids if v in found]
+        except YouTubeAPIError as e:
             logger.error(f"YouTube API error fetching video details: {e}")
             raise
 
@@ -245,83 +432,73 @@ class YouTubeAPIService:
         self,
         video_id: str,
         max_results: int = 100,
-        page_token: Optional[str] = None
+        page_token: Optional[str] = None,
+        include_replies: bool = False
     ) -> Dict[str, Any]:
-        """Fetch comments for a video"""
-        if not self.youtube:
-            raise ValueError("YouTube API key not configured")
-
-        def fetch():
-            request_params = {
-                "part": "snippet,replies",
-                "videoId": video_id,
-                "maxResults": min(max_results, 100),
-                "order": "relevance",
-                "textFormat": "plainText",
-            }
-            if page_token:
-                request_params["pageToken"] = page_token
-
-            request = self.youtube.commentThreads().list(**request_params)
-            return request.execute()
+        """Fetch comments for a video, with up to 5 inline replies each if requested"""
+        request_params = {
+            # Replies make the payload much larger; only ask for them when wanted
+            "part": "snippet,replies" if include_replies else "snippet",
+            "videoId": video_id,
+            "maxResults": min(max_results, 100),
+            "order": "relevance",
+            "textFormat": "plainText",
+        }
+        if page_token:
+            request_params["pageToken"] = page_token
 
         try:
-            response = await self._run_sync(fetch)
+            response = await self._get("commentThreads", **request_params)
             comments = []
 
             for item in response.get("items", []):
-                top_comment = item.get("snippet", {}).get("topLevelComment", {})
-                top_snippet = top_comment.get("snippet", {})
-
-                published_at = None
-                if top_snippet.get("publishedAt"):
-                    published_at = datetime.fromisoformat(
-                        top_snippet["publishedAt"].replace("Z", "+00:00")
-                    )
-
-                updated_at = None
-                if top_snippet.get("updatedAt"):
-                    updated_at = datetime.fromisoformat(
-                        top_snippet["updatedAt"].replace("Z", "+00:00")
-                    )
-
-                comment = {
-                    "youtube_comment_id": top_comment.get("id", ""),
-                    "author_name": top_snippet.get("authorDisplayName", ""),
-                    "author_channel_id": top_snippet.get("authorChannelId", {}).get("value", ""),
-                    "author_profile_image_url": top_snippet.get("authorProfileImageUrl", ""),
-                    "text_original": top_snippet.get("textOriginal", ""),
-                    "text_display": top_snippet.get("textDisplay", ""),
-                    "like_count": int(top_snippet.get("likeCount", 0)),
-                    "reply_count": item.get("snippet", {}).get("totalReplyCount", 0),
-                    "published_at": published_at,
-                    "updated_at": updated_at,
-                    "is_top_level": True,
-                    "replies": [],
-                }
+                thread = item.get("snippet") or _EMPTY
+                top_comment = thread.get("topLevelComment") or _EMPTY
+                top_snippet = top_comment.get("snippet") or _EMPTY
+
+                published_at = top_snippet.get("publishedAt")
+                if published_at:
+                    published_at = _parse_iso(published_at)
+
+                updated_at = top_snippet.get("updatedAt")
+                if updated_at:
+                    updated_at = _parse_iso(updated_at)
+
+                comment = CommentRecord(
+                    youtube_comment_id=top_comment.get("id", ""),
+                    author_name=top_snippet.get("authorDisplayName", ""),
+                    author_channel_id=(top_snippet.get("authorChannelId") or _EMPTY).get("value", ""),
+                    author_profile_image_url=top_snippet.get("authorProfileImageUrl", ""),
+                    text_original=top_snippet.get("textOriginal", ""),
+                    text_display=top_snippet.get("textDisplay", ""),
+                    like_count=int(top_snippet.get("likeCount", 0)),
+                    reply_count=thread.get("totalReplyCount", 0),
+                    published_at=published_at,
+                    updated_at=updated_at,
+                    is_top_level=True,
+                )
 
                 # Get replies if available
-                replies = item.get("replies", {}).get("comments", [])
-                for reply in replies:
-                    reply_snippet = reply.get("snippet", {})
-                    reply_published = None
-                    if reply_snippet.get("publishedAt"):
-                        reply_published = datetime.fromisoformat(
-                            reply_snippet["publishedAt"].replace("Z", "+00:00")
-                        )
-
-                    comment["replies"].append({
-                        "youtube_comment_id": reply.get("id", ""),
-                        "author_name": reply_snippet.get("authorDisplayName", ""),
-                        "author_channel_id": reply_snippet.get("authorChannelId", {}).get("value", ""),
-                        "author_profile_image_url": reply_snippet.get("authorProfileImageUrl", ""),
-                        "text_original": reply_snippet.get("textOriginal", ""),
-                        "text_display": reply_snippet.get("textDisplay", ""),
-                        "like_count": int(reply_snippet.get("likeCount", 0)),
-                        "reply_count": 0,
-                        "published_at": reply_published,
-                        "is_top_level": False,
-                    })
+                if include_replies:
+                    replies = comment.replies
+                    for reply in (item.get("replies") or _EMPTY).get("comments", ()):
+                        reply_snippet = reply.get("snippet") or _EMPTY
+                        reply_published = reply_snippet.get("publishedAt")
+                        if reply_published:
+                            reply_published = _parse_iso(reply_published)
+
+                        replies.append(CommentRecord(
+                            youtube_comment_id=reply.get("id", ""),
+                            author_name=reply_snippet.get("authorDisplayName", ""),
+                            author_channel_id=(reply_snippet.get("authorChannelId") or _EMPTY).get("value", ""),
+                            author_profile_image_url=reply_snippet.get("authorProfileImageUrl", ""),
+                            text_original=reply_snippet.get("textOriginal", ""),
+                            text_display=reply_snippet.get("textDisplay", ""),
+                            like_count=int(reply_snippet.get("likeCount", 0)),
+                            reply_count=0,
+                            published_at=reply_published,
+                            is_top_level=False,
+                        ))
 
                 comments.append(comment)
 
@@ -329,8 +506,8 @@ class YouTubeAPIService:
                 "comments": comments,
                 "next_page_token": response.get("nextPageToken"),
             }
-        except HttpError as e:
-            if e.resp.status == 403:
+        except YouTubeAPIError as e:
+            if e.status == 403:
                 # Comments might be disabled
                 logger.warning(f"Comments disabled or inaccessible for video {video_id}")
                 return {"comments": [], "next_page_token": None}
@@ -339,11 +516,7 @@ class YouTubeAPIService:
 
     def _parse_duration(self, duration_str: str) -> int:
         """Parse ISO 8601 duration to seconds"""
-        import re
-        match = re.match(
-            r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?',
-            duration_str
-        )
+        match = _DURATION_RE.match(duration_str)
         if not match:
             return 0
 
@@ -1,9 +1,8 @@
+import asyncio
 import logging
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from typing import Optional
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy import select
 
 from app.db.database import AsyncSessionLocal
@@ -11,27 +10,44 @@ from app.models.sync import SyncConfig
 
 logger = logging.getLogger(__name__)
 
+# Long sleeps are split up so wall-clock changes (DST, NTP, suspend) are noticed
+MAX_SLEEP_SECONDS = 3600
+
+
+def _next_occurrence(sync_time: time, after: datetime) -> datetime:
+    """First naive local datetime strictly after `after` at the given time of day"""
+    candidate = after.replace(
+        hour=sync_time.hour, minute=sync_time.minute, second=0, microsecond=0
+    )
+    if candidate <= after:
+        candidate += timedelta(days=1)
+    return candidate
+
 
 class SyncScheduler:
+    """Runs the auto-sync once a day at the configured local time"""
+
     def __init__(self):
-        self.scheduler = AsyncIOScheduler()
-        self.job_id = "auto_sync"
         self._started = False
+        self._bootstrap_task: Optional[asyncio.Task] = None
+        self._daily_task: Optional[asyncio.Task] = None
+        self._next_run: Optional[datetime] = None
 
     def start(self):
         """Start the scheduler"""
         if not self._started:
-            self.scheduler.start()
             self._started = True
-            # Load config and schedule if enabled
-            import asyncio
-            asyncio.create_task(self._load_and_configure())
+            # Load config and schedule if enabled; keep a reference so the
+            # task can't be garbage-collected before it finishes
+            self._bootstrap_task = asyncio.create_task(self._load_and_configure())
             logger.info("SyncScheduler started")
 
     def shutdown(self):
         """Shutdown the scheduler"""
         if self._started:
-            self.scheduler.shutdown(wait=False)
+            if self._bootstrap_task and not self._bootstrap_task.done():
+                self._bootstrap_task.cancel()
+            self._cancel_daily()
             self._started = False
             logger.info("SyncScheduler shutdown")
 
@@ -56,23 +72,39 @@ class SyncScheduler:
     ):
         """Configure auto-sync schedule"""
         # Remove existing job if any
-        if self.scheduler.get_job(self.job_id):
-            self.scheduler.remove_job(self.job_id)
+        if self._daily_task is not None:
+            self._cancel_daily()
             logger.info("Removed existing auto-sync job")
 
         if enabled and sync_time:
-            self.scheduler.add_job(
-                self._run_auto_sync,
-                CronTrigger(hour=sync_time.hour, minute=sync_time.minute),
-                id=self.job_id,
-                args=[sync_type],
-                replace_existing=True
-            )
+            self._daily_task = asyncio.create_task(self._daily_loop(sync_time, sync_type))
             logger.info(
                 f"Scheduled auto-sync at {sync_time.hour:02d}:{sync_time.minute:02d} "
                 f"(type: {sync_type})"
             )
 
+    def _cancel_daily(self):
+        if self._daily_task is not None:
+            self._daily_task.cancel()
+            self._daily_task = None
+        self._next_run = None
+
+    async def _daily_loop(self, sync_time: time, sync_type: str):
+        """Sleep until each day's sync time, then start the sync"""
+        # Naive local times, so the comparison follows the wall clock across DST
+        next_run = _next_occurrence(sync_time, datetime.now())
+        while True:
+            self._next_run = next_run
+            while True:
+                delay = (next_run - datetime.now()).total_seconds()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(min(delay, MAX_SLEEP_SECONDS))
+
+            await self._run_auto_sync(sync_type)
+            # Never schedule into the past (e.g. after a long suspend)
+            next_run = _next_occurrence(sync_time, max(next_run, datetime.now()))
+
     async def _run_auto_sync(self, sync_type: str):
         """Run the automatic sync"""
         from app.tasks.task_manager import task_manager
@@ -88,14 +120,11 @@ class SyncScheduler:
 
     def get_next_run_time(self) -> Optional[datetime]:
         """Get the next scheduled run time"""
-        job = self.scheduler.get_job(self.job_id)
-        if job:
-            return job.next_run_time
-        return None
+        return self._next_run.astimezone() if self._next_run else None
 
     def is_enabled(self) -> bool:
         """Check if auto-sync is enabled"""
-        return self.scheduler.get_job(self.job_id) is not None
+        return self._daily_task is not None
 
 
 sync_scheduler = SyncScheduler()
@@ -1,23 +1,100 @@
 import asyncio
 import logging
-from typing import Optional, List, Set, Dict, Any
-from datetime import datetime
+import time
+from typing import Optional, List, Set, Dict, Any, Awaitable, TypeVar
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, field
 from enum import Enum
 
-from sqlalchemy import select, update, and_
+import orjson
+from sqlalchemy import ARRAY, Row, String, any_, bindparam, insert, select, update, and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import AsyncSessionLocal
+from app.db.database import AsyncSessionLocal, engine
 from app.models.sync import SyncJob, DownloadQueue, SyncConfig, ErrorLog, SyncHistory
 from app.models.video import Video
 from app.models.channel import Channel
 from app.models.comment import Comment
-from app.services.youtube_api import youtube_api
-from app.services.video_downloader import video_downloader
+from app.schemas.status import WSDownloadProgressDict
+from app.services.cache import cache
+from app.services.youtube_api import CommentRecord, youtube_api
+from app.services.video_downloader import ProgressUpdate, video_downloader
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Redis channel that fans broadcasts out to every backend replica
+BROADCAST_CHANNEL = "ytarchive:broadcast"
+
+# Videos whose details are fetched and saved together (videos.list accepts up to 50 IDs)
+VIDEO_BATCH_SIZE = 50
+
+# Videos whose comments are synced concurrently
+COMMENT_WORKERS = 8
+
+# Columns of a saved video that the download and comment steps read; the
+# sync works on these plain rows rather than ORM-tracked Video objects
+SYNCED_VIDEO_COLUMNS = (Video.id, Video.youtube_video_id, Video.title, Video.is_downloaded)
+
+# Channel metadata refreshed this recently is not fetched again at sync start
+CHANNEL_INFO_FRESH_FOR = timedelta(hours=1)
+
+# Comment rows per upsert statement, well under asyncpg's bind parameter limit
+COMMENT_UPSERT_CHUNK = 1000
+
+# Progress updates are coalesced and sent at most this often (seconds)
+PROGRESS_FLUSH_INTERVAL = 0.25
+
+# Job progress counters are persisted at most this often (seconds); clients
+# get live progress over the WebSocket
+PROGRESS_WRITE_INTERVAL = 1.0
+
+# A WebSocket client that can't take a message within this long is dropped (seconds)
+WS_SEND_TIMEOUT = 2.0
+
+# How long a stopped sync gets to wind down on its own before it is cancelled outright
+STOP_GRACE_SECONDS = 5
+
+
+# Statements run for every video or error, built once; values are bound per call.
+# They target the tables directly so the session skips ORM update bookkeeping.
+_sync_jobs = SyncJob.__table__
+_UPDATE_JOB_PROGRESS = (
+    update(_sync_jobs)
+    .where(_sync_jobs.c.id == bindparam("job_id"))
+    .values(
+        total_items=bindparam("total"),
+        processed_items=bindparam("processed"),
+        resume_from=bindparam("cursor"),
+    )
+)
+_SELECT_JOB_START = select(_sync_jobs.c.started_at).where(_sync_jobs.c.id == bindparam("job_id"))
+_INSERT_ERROR = insert(ErrorLog.__table__)
+
+
+def _comment_row(
+    video_id: int,
+    comment_data: CommentRecord,
+    parent_id: Optional[int]
+) -> Dict[str, Any]:
+    """Column values for a comment's row"""
+    return {
+        "youtube_comment_id": comment_data.youtube_comment_id,
+        "video_id": video_id,
+        "parent_comment_id": parent_id,
+        "author_name": comment_data.author_name,
+        "author_channel_id": comment_data.author_channel_id,
+        "author_profile_image_url": comment_data.author_profile_image_url,
+        "text_original": comment_data.text_original,
+        "text_display": comment_data.text_display,
+        "like_count": comment_data.like_count,
+        "reply_count": comment_data.reply_count,
+        "published_at": comment_data.published_at,
+        "is_top_level": comment_data.is_top_level,
+    }
+
 
 class TaskStatus(Enum):
     IDLE = "idle"
@@ -35,6 +112,9 @@ class SyncProgress:
     processed_items: int = 0
     current_item: Optional[str] = None
     error: Optional[str] = None
+    # YouTube ID of the last video whose work is done; persisted so an
+    # interrupted job can skip ahead when resumed
+    resume_from: Optional[str] = None
 
 
 @dataclass
@@ -54,23 +134,36 @@ class TaskManager:
         self.sync_progress: SyncProgress = SyncProgress()
         self.download_progress: Dict[int, DownloadProgress] = {}
         self.websocket_connections: Set = set()
-        self.cancel_requested: bool = False
+        # Set to ask the running sync to stop at its next await
+        self._cancel_event = asyncio.Event()
+        self._last_progress_write = 0.0
+        # Bumped whenever download_progress changes; part of the status cache key
+        self._downloads_version = 0
+        self._status_key: Optional[tuple] = None
+        self._status_cache: Dict[str, Any] = {}
         self._initialized: bool = False
+        self._relay_task: Optional[asyncio.Task] = None
+        self._pending_progress: Dict[str, dict] = {}
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def initialize(self):
         """Initialize the task manager"""
+        if cache.redis is not None:
+            self._relay_task = asyncio.create_task(self._relay_broadcasts())
         self._initialized = True
-        logger.info("TaskManager initialized")
+        logger.info(f"TaskManager initialized (DB pool: {engine.pool.status()})")
 
     async def shutdown(self):
         """Shutdown the task manager"""
         if self.current_task and not self.current_task.done():
-            self.cancel_requested = True
-            self.current_task.cancel()
+            await self._stop_current_task()
+        if self._relay_task:
+            self._relay_task.cancel()
             try:
-                await self.current_task
+                await self._relay_task
             except asyncio.CancelledError:
                 pass
+            self._relay_task = None
         self._initialized = False
         logger.info("TaskManager shutdown")
 
@@ -84,13 +177,65 @@ class TaskManager:
 
     async def broadcast(self, message: dict):
         """Broadcast message to all connected WebSocket clients"""
-        disconnected = set()
-        for ws in self.websocket_connections:
+        # Deliver any coalesced progress first so clients see events in order
+        if self._pending_progress:
+            await self._flush_progress()
+        await self._publish(message)
+
+    def broadcast_progress(self, key: str, message: dict):
+        """Queue a progress update; only the latest per key is sent each interval"""
+        self._pending_progress[key] = message
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_progress_soon())
+
+    async def _flush_progress_soon(self):
+        await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+        await self._flush_progress()
+
+    async def _flush_progress(self):
+        pending, self._pending_progress = self._pending_progress, {}
+        for message in pending.values():
+            await self._publish(message)
+
+    async def _publish(self, message: dict):
+        # Encode once for every recipient
+        payload = orjson.dumps(message)
+        if cache.redis is not None:
+            try:
+                await cache.redis.publish(BROADCAST_CHANNEL, payload)
+                return
+            except Exception as e:
+                logger.warning(f"Broadcast publish failed, sending locally: {e}")
+        await self._send_local(payload.decode())
+
+    async def _send_local(self, text: str):
+        """Send an encoded message to this process's WebSocket clients concurrently"""
+        connections = list(self.websocket_connections)
+        if not connections:
+            return
+        # Bounded per client so one stuck socket can't hold up the rest
+        results = await asyncio.gather(
+            *(asyncio.wait_for(ws.send_text(text), WS_SEND_TIMEOUT) for ws in connections),
+            return_exceptions=True
+        )
+        for ws, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.websocket_connections.discard(ws)
+
+    async def _relay_broadcasts(self):
+        """Forward broadcasts published by any replica to local clients"""
+        while True:
             try:
-                await ws.send_json(message)
-            except Exception:
-                disconnected.add(ws)
-        self.websocket_connections -= disconnected
+                async with cache.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(BROADCAST_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            await self._send_local(message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Broadcast relay error: {e}")
+                await asyncio.sleep(1)
 
     async def check_and_resume_sync(self):
         """Check for incomplete sync jobs and resume them"""
@@ -137,7 +282,7 @@ class TaskManager:
         if not channel_id and not resume_job_id:
             raise Exception("channel_id is required")
 
-        self.cancel_requested = False
+        self._cancel_event.clear()
 
         async with AsyncSessionLocal() as db:
             if resume_job_id:
@@ -148,6 +293,7 @@ class TaskManager:
                 if not job:
                     raise Exception(f"Job {resume_job_id} not found")
                 channel_id = job.channel_id
+                resume_from = job.resume_from
             else:
                 # Verify channel exists
                 channel_result = await db.execute(
@@ -164,8 +310,9 @@ class TaskManager:
                     started_at=datetime.utcnow()
                 )
                 db.add(job)
+                # The insert's RETURNING already filled in job.id
                 await db.commit()
-                await db.refresh(job)
+                resume_from = None
 
             job_id = job.id
 
@@ -176,8 +323,10 @@ class TaskManager:
             channel_id=channel_id
         )
 
+        await cache.delete_pattern("status:*")
+
         self.current_task = asyncio.create_task(
-            self._run_sync(job_id, job_type, time_filter, channel_id)
+            self._run_sync(job_id, job_type, time_filter, channel_id, resume_from)
         )
 
         return job_id
@@ -185,26 +334,71 @@ class TaskManager:
     async def stop_sync(self):
         """Stop the current sync job"""
         if self.current_task and not self.current_task.done():
-            self.cancel_requested = True
-            self.current_task.cancel()
+            # The sync resets its progress as it exits, so read it first
+            progress = self.sync_progress
+            await self._stop_current_task()
 
             async with AsyncSessionLocal() as db:
-                if self.sync_progress.job_id:
+                if progress.job_id:
                     await db.execute(
                         update(SyncJob)
-                        .where(SyncJob.id == self.sync_progress.job_id)
-                        .values(status="cancelled", completed_at=datetime.utcnow())
+                        .where(SyncJob.id == progress.job_id)
+                        .values(
+                            status="cancelled",
+                            total_items=progress.total_items,
+                            processed_items=progress.processed_items,
+                            completed_at=datetime.utcnow()
+                        )
                     )
                     await db.commit()
 
             await self.broadcast({
                 "type": "sync_cancelled",
-                "data": {"job_id": self.sync_progress.job_id}
+                "data": {"job_id": progress.job_id}
             })
 
             self.sync_progress = SyncProgress()
+            await cache.delete_pattern("status:*")
+
+    def is_cancelled(self) -> bool:
+        """Whether the running sync has been asked to stop"""
+        return self._cancel_event.is_set()
+
+    async def _stop_current_task(self):
+        """Ask the running sync to stop, cancelling it outright if it doesn't"""
+        self._cancel_event.set()
+        # The sync normally leaves at its next API or download await, which
+        # keeps cancellation out of the middle of a DB commit
+        done, _ = await asyncio.wait({self.current_task}, timeout=STOP_GRACE_SECONDS)
+        if not done:
+            self.current_task.cancel()
+        try:
+            await self.current_task
+        except asyncio.CancelledError:
+            pass
 
-    async def _run_sync(self, job_id: int, job_type: str, time_filter: str, channel_id: int):
+    async def _race_cancel(self, aw: Awaitable[T]) -> T:
+        """Await a long-running call, giving up as soon as the sync is stopped"""
+        work = asyncio.ensure_future(aw)
+        stop = asyncio.ensure_future(self._cancel_event.wait())
+        try:
+            await asyncio.wait({work, stop}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop.cancel()
+            if not work.done():
+                work.cancel()
+        if work.done() and not work.cancelled():
+            return work.result()
+        raise asyncio.CancelledError
+
+    async def _run_sync(
+        self,
+        job_id: int,
+        job_type: str,
+        time_filter: str,
+        channel_id: int,
+        resume_from: Optional[str] = None
+    ):
         """Main sync orchestration"""
         try:
             async with AsyncSessionLocal() as db:
@@ -220,7 +414,7 @@ class TaskManager:
                 # Update channel info first
                 await self._sync_channel_info(db, channel)
 
-                if self.cancel_requested:
+                if self.is_cancelled():
                     return
 
                 # Get videos list from YouTube
@@ -229,37 +423,91 @@ class TaskManager:
                     db, channel, time_filter_date, job_type
                 )
 
-                if self.cancel_requested:
+                if self.is_cancelled():
                     return
 
-                self.sync_progress.total_items = len(videos_to_sync)
-                await self._update_job_progress(db, job_id)
-
-                # Process videos
-                for i, video_data in enumerate(videos_to_sync):
-                    if self.cancel_requested:
-                        break
-
-                    self.sync_progress.current_item = video_data.get("title", "Unknown")
-                    await self.broadcast({
-                        "type": "sync_progress",
-                        "data": {
-                            "job_id": job_id,
-                            "total": self.sync_progress.total_items,
-                            "processed": self.sync_progress.processed_items,
-                            "current_video": self.sync_progress.current_item,
-                            "percent_complete": (i / len(videos_to_sync)) * 100 if videos_to_sync else 0
-                        }
-                    })
-
-                    try:
-                        await self._process_video(db, channel, video_data, job_type, job_id)
-                    except Exception as e:
-                        logger.error(f"Error processing video {video_data.get('youtube_video_id')}: {e}")
-                        await self._log_error(db, job_id, None, str(e))
-
-                    self.sync_progress.processed_items += 1
-                    await self._update_job_progress(db, job_id)
+                listed = len(videos_to_sync)
+                if resume_from:
+                    videos_to_sync = await self._skip_resumed(
+                        db, videos_to_sync, resume_from, job_type
+                    )
+                self.sync_progress.total_items = listed
+                self.sync_progress.processed_items = listed - len(videos_to_sync)
+                self.sync_progress.resume_from = resume_from
+                await self._update_job_progress(db, job_id, force=True)
+
+                # Process videos a batch at a time: one details call and one
+                # upsert per batch, then the per-video download/comments work
+                comment_slots = asyncio.Semaphore(COMMENT_WORKERS)
+                # Downloads run one at a time in the background: each video's
+                # download starts when the previous one finishes, while this loop
+                # moves on to the next video's comments and batch metadata.
+                # Leaving a task group waits for its tasks; an error or
+                # cancellation in the loop cancels them instead.
+                download_task: Optional[asyncio.Task] = None
+                async with asyncio.TaskGroup() as downloads:
+                    for start in range(0, len(videos_to_sync), VIDEO_BATCH_SIZE):
+                        if self.is_cancelled():
+                            break
+
+                        batch = videos_to_sync[start:start + VIDEO_BATCH_SIZE]
+                        details = await self._prefetch_details(batch)
+                        try:
+                            videos = await self._upsert_videos(db, channel, batch, details)
+                        except Exception as e:
+                            logger.error(f"Error saving video metadata: {e}")
+                            await db.rollback()
+                            await self._log_error(db, job_id, None, str(e))
+                            videos = {}
+
+                        # Comments for the whole batch are fetched concurrently in the
+                        # background while downloads run one at a time below
+                        async with asyncio.TaskGroup() as comments:
+                            comment_tasks: Dict[str, asyncio.Task] = {}
+                            if job_type in ["full", "new_only", "comments"]:
+                                comment_tasks = {
+                                    youtube_id: comments.create_task(
+                                        self._sync_comments_worker(video, job_id, comment_slots)
+                                    )
+                                    for youtube_id, video in videos.items()
+                                }
+
+                            for video_data in batch:
+                                if self.is_cancelled():
+                                    break
+
+                                self.sync_progress.current_item = video_data.get("title", "Unknown")
+                                self.broadcast_progress("sync_progress", {
+                                    "type": "sync_progress",
+                                    "data": {
+                                        "job_id": job_id,
+                                        "total": self.sync_progress.total_items,
+                                        "processed": self.sync_progress.processed_items,
+                                        "current_video": self.sync_progress.current_item,
+                                        "percent_complete": self.sync_progress.processed_items / self.sync_progress.total_items * 100
+                                    }
+                                })
+
+                                # The workers log their own errors, so these awaits
+                                # only raise when the sync is cancelled
+                                youtube_id = video_data["youtube_video_id"]
+                                video = videos.get(youtube_id)
+                                if video is not None:
+                                    if self._needs_download(video, job_type):
+                                        if download_task is not None:
+                                            await download_task
+                                        download_task = downloads.create_task(
+                                            self._download_worker(video, job_id)
+                                        )
+                                    if youtube_id in comment_tasks:
+                                        await comment_tasks[youtube_id]
+
+                                self.sync_progress.processed_items += 1
+                                self.sync_progress.resume_from = youtube_id
+                                await self._update_job_progress(db, job_id)
+
+                if self.is_cancelled():
+                    return
 
                 # Complete the job
                 await db.execute(
@@ -267,6 +515,8 @@ class TaskManager:
                     .where(SyncJob.id == job_id)
                     .values(
                         status="completed",
+                        total_items=self.sync_progress.total_items,
+                        processed_items=self.sync_progress.processed_items,
                         completed_at=datetime.utcnow()
                     )
                 )
@@ -295,6 +545,9 @@ class TaskManager:
             logger.info(f"Sync job {job_id} was cancelled")
             raise
         except Exception as e:
+            # Errors raised inside the task groups arrive wrapped
+            while isinstance(e, ExceptionGroup):
+                e = e.exceptions[0]
             logger.error(f"Sync job {job_id} failed: {e}")
             async with AsyncSessionLocal() as db:
                 await db.execute(
@@ -314,11 +567,21 @@ class TaskManager:
             })
         finally:
             self.sync_progress = SyncProgress()
+            # Job finished one way or another; drop cached status snapshots
+            await cache.delete_pattern("status:*")
 
     async def _sync_channel_info(self, db: AsyncSession, channel: Channel):
         """Update channel information from YouTube"""
+        if (
+            channel.metadata_updated_at is not None
+            and datetime.now(timezone.utc) - channel.metadata_updated_at < CHANNEL_INFO_FRESH_FOR
+        ):
+            return
+
         try:
-            info = await youtube_api.get_channel_info(channel.youtube_channel_id)
+            info = await self._race_cancel(
+                youtube_api.get_channel_info(channel.youtube_channel_id, use_cache=False)
+            )
             if info:
                 channel.title = info.get("title", channel.title)
                 channel.description = info.get("description")
@@ -327,6 +590,7 @@ class TaskManager:
                 channel.view_count = info.get("view_count")
                 channel.avatar_url = info.get("avatar_url")
                 channel.banner_url = info.get("banner_url")
+                channel.metadata_updated_at = datetime.now(timezone.utc)
                 await db.commit()
         except Exception as e:
             logger.error(f"Error syncing channel info: {e}")
@@ -339,220 +603,292 @@ class TaskManager:
         job_type: str
     ) -> List[Dict[str, Any]]:
         """Fetch list of videos to sync"""
-        all_videos = []
-        page_token = None
-
-        while True:
-            if self.cancel_requested:
-                break
-
-            result = await youtube_api.get_channel_videos(
-                channel.youtube_channel_id,
-                max_results=50,
-                published_after=published_after,
-                page_token=page_token
-            )
-
-            videos = result.get("videos", [])
-            all_videos.extend(videos)
-
-            page_token = result.get("next_page_token")
-            if not page_token:
-                break
+        all_videos = await self._race_cancel(youtube_api.get_all_channel_videos(
+            channel.youtube_channel_id,
+            published_after=published_after
+        ))
 
         # For 'new_only', filter out already downloaded videos
-        if job_type == "new_only":
-            existing_ids = set()
-            result = await db.execute(
-                select(Video.youtube_video_id).where(Video.is_downloaded == True)
-            )
-            existing_ids = {row[0] for row in result.fetchall()}
+        if job_type == "new_only" and all_videos:
+            # Only the listed IDs are checked, passed as one array parameter,
+            # so the result is bounded by this sync rather than the archive
+            listed_ids = [v["youtube_video_id"] for v in all_videos]
+            existing_ids = set(await db.scalars(
+                select(Video.youtube_video_id).where(
+                    Video.youtube_video_id == any_(
+                        bindparam("listed_ids", listed_ids, type_=ARRAY(String))
+                    ),
+                    Video.is_downloaded == True
+                )
+            ))
             all_videos = [v for v in all_videos if v["youtube_video_id"] not in existing_ids]
 
         return all_videos
 
-    async def _process_video(
+    async def _skip_resumed(
         self,
         db: AsyncSession,
-        channel: Channel,
-        video_data: Dict[str, Any],
-        job_type: str,
-        job_id: int
-    ):
-        """Process a single video (metadata, download, comments)"""
-        youtube_id = video_data["youtube_video_id"]
+        videos: List[Dict[str, Any]],
+        resume_from: str,
+        job_type: str
+    ) -> List[Dict[str, Any]]:
+        """Drop the videos an interrupted run of this job already finished"""
+        ids = [v["youtube_video_id"] for v in videos]
+        try:
+            cut = ids.index(resume_from) + 1
+        except ValueError:
+            # The cursor has dropped out of the listing; start over
+            return videos
+
+        # Videos listed before the cursor were handled, except ones uploaded
+        # since the interruption or whose download never finished
+        done_query = select(Video.youtube_video_id).where(
+            Video.youtube_video_id == any_(
+                bindparam("done_ids", ids[:cut], type_=ARRAY(String))
+            )
+        )
+        if job_type in ["full", "new_only"]:
+            done_query = done_query.where(Video.is_downloaded == True)
+        done = set(await db.scalars(done_query))
 
-        # Get detailed info
-        details = await youtube_api.get_video_details([youtube_id])
-        if details:
-            video_data.update(details[0])
+        remaining = [v for v in videos[:cut] if v["youtube_video_id"] not in done]
+        remaining.extend(videos[cut:])
+        logger.info(f"Resuming after {resume_from}: skipping {len(videos) - len(remaining)} videos")
+        return remaining
 
-        # Check if video exists
-        result = await db.execute(
-            select(Video).where(Video.youtube_video_id == youtube_id)
-        )
-        video = result.scalar_one_or_none()
-
-        if video:
-            # Update metadata
-            video.title = video_data.get("title", video.title)
-            video.description = video_data.get("description")
-            video.view_count = video_data.get("view_count")
-            video.like_count = video_data.get("like_count")
-            video.comment_count = video_data.get("comment_count")
-            video.metadata_updated_at = datetime.utcnow()
-        else:
-            # Create new video
-            video = Video(
-                youtube_video_id=youtube_id,
-                channel_id=channel.id,
-                title=video_data.get("title", ""),
-                description=video_data.get("description"),
-                upload_date=video_data.get("upload_date"),
-                duration=video_data.get("duration"),
-                view_count=video_data.get("view_count"),
-                like_count=video_data.get("like_count"),
-                comment_count=video_data.get("comment_count"),
-                thumbnail_url=video_data.get("thumbnail_url"),
-                tags=video_data.get("tags"),
-                category=video_data.get("category"),
-            )
-            db.add(video)
+    async def _prefetch_details(
+        self,
+        videos: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Detailed info for a batch of videos, keyed by YouTube video ID"""
+        try:
+            details = await self._race_cancel(youtube_api.get_video_details(
+                [v["youtube_video_id"] for v in videos]
+            ))
+        except Exception as e:
+            # Videos are still saved from their playlist entries
+            logger.error(f"Error fetching video details: {e}")
+            return {}
+        return {d["youtube_video_id"]: d for d in details}
 
+    async def _upsert_videos(
+        self,
+        db: AsyncSession,
+        channel: Channel,
+        batch: List[Dict[str, Any]],
+        details: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Row]:
+        """Insert or update a batch of videos in one statement, keyed by YouTube video ID"""
+        rows = {}
+        for video_data in batch:
+            youtube_id = video_data["youtube_video_id"]
+            # Prefer the detailed info over the playlist entry
+            data = {**video_data, **details.get(youtube_id, {})}
+            rows[youtube_id] = {
+                "youtube_video_id": youtube_id,
+                "channel_id": channel.id,
+                "title": data.get("title", ""),
+                "description": data.get("description"),
+                "upload_date": data.get("upload_date"),
+                "duration": data.get("duration"),
+                "view_count": data.get("view_count"),
+                "like_count": data.get("like_count"),
+                "comment_count": data.get("comment_count"),
+                "thumbnail_url": data.get("thumbnail_url"),
+                "tags": data.get("tags"),
+                "category": data.get("category"),
+            }
+        if not rows:
+            return {}
+
+        stmt = pg_insert(Video).values(list(rows.values()))
+        # Existing videos only get their metadata refreshed
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Video.youtube_video_id],
+            set_={
+                "title": stmt.excluded.title,
+                "description": stmt.excluded.description,
+                "view_count": stmt.excluded.view_count,
+                "like_count": stmt.excluded.like_count,
+                "comment_count": stmt.excluded.comment_count,
+                "metadata_updated_at": func.now(),
+                # Core upserts don't fire the ORM's onupdate
+                "updated_at": func.now(),
+            }
+        )
+        result = await db.execute(stmt.returning(*SYNCED_VIDEO_COLUMNS))
+        videos = {video.youtube_video_id: video for video in result.all()}
         await db.commit()
-        await db.refresh(video)
+        return videos
 
-        # Download video if needed
-        if job_type in ["full", "new_only"] and not video.is_downloaded:
-            await self._download_video(db, video, job_id)
+    def _needs_download(self, video: Row, job_type: str) -> bool:
+        """Whether the job type calls for downloading a saved video"""
+        return job_type in ["full", "new_only"] and not video.is_downloaded
 
-        # Sync comments if needed
-        if job_type in ["full", "new_only", "comments"]:
-            await self._sync_comments(db, video)
+    async def _sync_comments_worker(self, video: Row, job_id: int, slots: asyncio.Semaphore):
+        """Sync a video's comments on a session of its own, within the worker limit"""
+        async with slots:
+            async with AsyncSessionLocal() as db:
+                try:
+                    await self._sync_comments(db, video)
+                except Exception as e:
+                    logger.error(f"Error syncing comments for video {video.youtube_video_id}: {e}")
+                    await db.rollback()
+                    await self._log_error(db, job_id, video.id, str(e))
+
+    async def _download_worker(self, video: Row, job_id: int):
+        """Download a video on a session of its own, apart from the sync loop's commits"""
+        async with AsyncSessionLocal() as db:
+            try:
+                await self._download_video(db, video, job_id)
+            except Exception as e:
+                logger.error(f"Error downloading video {video.youtube_video_id}: {e}")
+                await db.rollback()
+                await self._log_error(db, job_id, video.id, str(e))
 
-    async def _download_video(self, db: AsyncSession, video: Video, job_id: int):
+    async def _download_video(self, db: AsyncSession, video: Row, job_id: int):
         """Download a video"""
         self.sync_progress.status = TaskStatus.DOWNLOADING
 
-        async def progress_callback(progress: Dict[str, Any]):
-            self.download_progress[video.id] = DownloadProgress(
-                video_id=video.id,
-                youtube_id=video.youtube_video_id,
-                title=video.title,
-                progress=progress.get("progress", 0),
-                speed=progress.get("speed"),
-                eta=progress.get("eta"),
-                status=progress.get("status", "downloading")
-            )
-            await self.broadcast({
+        def progress_callback(progress: ProgressUpdate):
+            data: WSDownloadProgressDict = {
+                "video_id": video.id,
+                "youtube_id": video.youtube_video_id,
+                "title": video.title,
+                "progress": progress.get("progress", 0),
+                "speed": progress.get("speed"),
+                "eta": progress.get("eta"),
+                "status": progress.get("status", "downloading")
+            }
+            self.download_progress[video.id] = DownloadProgress(**data)
+            self._downloads_version += 1
+            # Trusted internal payload: encoded as-is, no schema validation
+            self.broadcast_progress(f"download_progress:{video.id}", {
                 "type": "download_progress",
-                "data": {
-                    "video_id": video.id,
-                    "youtube_id": video.youtube_video_id,
-                    "title": video.title,
-                    "progress": progress.get("progress", 0),
-                    "speed": progress.get("speed"),
-                    "eta": progress.get("eta"),
-                    "status": progress.get("status", "downloading")
-                }
+                "data": data
             })
 
-        result = await video_downloader.download_video(
+        result = await self._race_cancel(video_downloader.download_video(
             video.youtube_video_id,
-            progress_callback=progress_callback
-        )
+            progress_callback=progress_callback,
+            should_stop=self.is_cancelled
+        ))
 
         if result.get("success"):
-            video.is_downloaded = True
-            video.video_local_path = result.get("video_path")
-            video.thumbnail_local_path = result.get("thumbnail_path")
-            video.video_size_bytes = result.get("file_size")
-            video.video_quality = result.get("quality")
-            video.downloaded_at = datetime.utcnow()
+            await db.execute(
+                update(Video)
+                .where(Video.id == video.id)
+                .values(
+                    is_downloaded=True,
+                    video_local_path=result.get("video_path"),
+                    thumbnail_local_path=result.get("thumbnail_path"),
+                    video_size_bytes=result.get("file_size"),
+                    video_quality=result.get("quality"),
+                    downloaded_at=datetime.utcnow()
+                )
+            )
             await db.commit()
         else:
             await self._log_error(db, job_id, video.id, result.get("error", "Download failed"))
 
         self.download_progress.pop(video.id, None)
+        self._downloads_version += 1
         self.sync_progress.status = TaskStatus.SYNCING
 
-    async def _sync_comments(self, db: AsyncSession, video: Video):
+    async def _sync_comments(self, db: AsyncSession, video: Row):
         """Sync comments for a video"""
-        page_token = None
+        if self.is_cancelled():
+            return
 
+        result = await self._fetch_comment_page(video, None)
         while True:
-            if self.cancel_requested:
-                break
-
-            result = await youtube_api.get_video_comments(
-                video.youtube_video_id,
-                max_results=100,
-                page_token=page_token
+            page_token = result.get("next_page_token")
+            # Save this page while the next one is being fetched; pages are
+            # cursor-chained, so fetches themselves stay serial
+            save = asyncio.create_task(
+                self._save_comment_page(db, video.id, result.get("comments", []))
             )
+            try:
+                if page_token and not self.is_cancelled():
+                    result = await self._fetch_comment_page(video, page_token)
+                else:
+                    page_token = None
+            except BaseException:
+                # Don't leave the save running on a session that is about to close
+                save.cancel()
+                await asyncio.gather(save, return_exceptions=True)
+                raise
+            await save
 
-            for comment_data in result.get("comments", []):
-                await self._save_comment(db, video.id, comment_data)
-
-            page_token = result.get("next_page_token")
             if not page_token:
                 break
 
         await db.commit()
 
-    async def _save_comment(
+    async def _fetch_comment_page(self, video: Row, page_token: Optional[str]) -> Dict[str, Any]:
+        """Fetch one page of a video's comment threads with their replies"""
+        return await self._race_cancel(youtube_api.get_video_comments(
+            video.youtube_video_id,
+            max_results=100,
+            page_token=page_token,
+            include_replies=True
+        ))
+
+    async def _save_comment_page(
         self,
         db: AsyncSession,
         video_id: int,
-        comment_data: Dict[str, Any],
-        parent_id: Optional[int] = None
+        comments: List[CommentRecord]
     ):
-        """Save a comment and its replies"""
-        # Check if comment exists
-        result = await db.execute(
-            select(Comment).where(
-                Comment.youtube_comment_id == comment_data["youtube_comment_id"]
-            )
+        """Upsert a page of comments, then their replies, one statement per level"""
+        # Top-level comments first, so replies can be pointed at their parent's row
+        parent_ids = await self._upsert_comments(
+            db, [_comment_row(video_id, c, None) for c in comments]
         )
-        comment = result.scalar_one_or_none()
+        await self._upsert_comments(db, [
+            _comment_row(video_id, reply, parent_ids.get(c.youtube_comment_id))
+            for c in comments
+            for reply in c.replies
+        ])
 
-        if comment:
-            # Update existing
-            comment.text_original = comment_data.get("text_original", comment.text_original)
-            comment.like_count = comment_data.get("like_count", comment.like_count)
-            comment.reply_count = comment_data.get("reply_count", comment.reply_count)
-        else:
-            # Create new
-            comment = Comment(
-                youtube_comment_id=comment_data["youtube_comment_id"],
-                video_id=video_id,
-                parent_comment_id=parent_id,
-                author_name=comment_data.get("author_name"),
-                author_channel_id=comment_data.get("author_channel_id"),
-                author_profile_image_url=comment_data.get("author_profile_image_url"),
-                text_original=comment_data.get("text_original", ""),
-                text_display=comment_data.get("text_display"),
-                like_count=comment_data.get("like_count", 0),
-                reply_count=comment_data.get("reply_count", 0),
-                published_at=comment_data.get("published_at"),
-                is_top_level=comment_data.get("is_top_level", True),
+    async def _upsert_comments(
+        self,
+        db: AsyncSession,
+        rows: List[Dict[str, Any]]
+    ) -> Dict[str, int]:
+        """Insert or update comment rows, returning their IDs keyed by YouTube comment ID"""
+        # ON CONFLICT can't touch the same row twice in one statement
+        unique_rows = list({row["youtube_comment_id"]: row for row in rows}.values())
+        ids: Dict[str, int] = {}
+        for start in range(0, len(unique_rows), COMMENT_UPSERT_CHUNK):
+            stmt = pg_insert(Comment).values(unique_rows[start:start + COMMENT_UPSERT_CHUNK])
+            # Existing comments only get their text and counts refreshed
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Comment.youtube_comment_id],
+                set_={
+                    "text_original": stmt.excluded.text_original,
+                    "like_count": stmt.excluded.like_count,
+                    "reply_count": stmt.excluded.reply_count,
+                }
             )
-            db.add(comment)
-            await db.flush()
-
-        # Process replies
-        for reply_data in comment_data.get("replies", []):
-            await self._save_comment(db, video_id, reply_data, comment.id)
-
-    async def _update_job_progress(self, db: AsyncSession, job_id: int):
-        """Update job progress in database"""
-        await db.execute(
-            update(SyncJob)
-            .where(SyncJob.id == job_id)
-            .values(
-                total_items=self.sync_progress.total_items,
-                processed_items=self.sync_progress.processed_items
+            result = await db.execute(
+                stmt.returning(Comment.youtube_comment_id, Comment.id)
             )
-        )
+            ids.update(result.tuples().all())
+        return ids
+
+    async def _update_job_progress(self, db: AsyncSession, job_id: int, force: bool = False):
+        """Update job progress in database, at most once per PROGRESS_WRITE_INTERVAL"""
+        now = time.monotonic()
+        if not force and now - self._last_progress_write < PROGRESS_WRITE_INTERVAL:
+            return
+        self._last_progress_write = now
+        await db.execute(_UPDATE_JOB_PROGRESS, {
+            "job_id": job_id,
+            "total": self.sync_progress.total_items,
+            "processed": self.sync_progress.processed_items,
+            "cursor": self.sync_progress.resume_from,
+        })
         await db.commit()
 
     async def _log_error(
@@ -563,38 +899,50 @@ class TaskManager:
         error_message: str
     ):
         """Log an error"""
-        error = ErrorLog(
-            sync_job_id=job_id,
-            video_id=video_id,
-            error_message=error_message
-        )
-        db.add(error)
+        await db.execute(_INSERT_ERROR, {
+            "sync_job_id": job_id,
+            "video_id": video_id,
+            "error_message": error_message,
+        })
         await db.commit()
 
     async def _get_job_start_time(self, db: AsyncSession, job_id: int) -> datetime:
         """Get the start time of a job"""
-        result = await db.execute(
-            select(SyncJob.started_at).where(SyncJob.id == job_id)
-        )
+        result = await db.execute(_SELECT_JOB_START, {"job_id": job_id})
         started_at = result.scalar_one_or_none()
         return started_at or datetime.utcnow()
 
     def get_current_status(self) -> Dict[str, Any]:
-        """Get current sync status"""
-        return {
-            "status": self.sync_progress.status.value,
-            "job_id": self.sync_progress.job_id,
-            "job_type": self.sync_progress.job_type,
-            "channel_id": self.sync_progress.channel_id,
-            "total_items": self.sync_progress.total_items,
-            "processed_items": self.sync_progress.processed_items,
-            "current_item": self.sync_progress.current_item,
-            "percent_complete": (
-                (self.sync_progress.processed_items / self.sync_progress.total_items) * 100
-                if self.sync_progress.total_items > 0 else 0
-            ),
-            "downloads": list(self.download_progress.values())
-        }
+        """Get current sync status; the returned dict is shared and must not be modified"""
+        progress = self.sync_progress
+        # Rebuilt only when something it reports has changed since the last call
+        key = (
+            progress.job_id,
+            progress.job_type,
+            progress.channel_id,
+            progress.status,
+            progress.total_items,
+            progress.processed_items,
+            progress.current_item,
+            self._downloads_version,
+        )
+        if key != self._status_key:
+            self._status_cache = {
+                "status": progress.status.value,
+                "job_id": progress.job_id,
+                "job_type": progress.job_type,
+                "channel_id": progress.channel_id,
+                "total_items": progress.total_items,
+                "processed_items": progress.processed_items,
+                "current_item": progress.current_item,
+                "percent_complete": (
+                    (progress.processed_items / progress.total_items) * 100
+                    if progress.total_items > 0 else 0
+                ),
+                "downloads": list(self.download_progress.values())
+            }
+            self._status_key = key
+        return self._status_cache
 
 
 task_manager = TaskManager()
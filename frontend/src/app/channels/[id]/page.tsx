@@ -165,7 +165,7 @@ export default function ChannelDetailPage({ params }: PageProps) {
           {channel.banner_url && (
             <div className="h-48 rounded-xl overflow-hidden mb-6">
               <img
-                src={channelAPI.getBannerUrl(channel.id)}
+                src={channelAPI.getBannerUrl(channel.id, channel.banner_version)}
                 alt="Channel banner"
                 className="w-full h-full object-cover"
               />
@@ -177,7 +177,7 @@ export default function ChannelDetailPage({ params }: PageProps) {
             {/* Avatar */}
             {channel.avatar_url ? (
               <img
-                src={channelAPI.getAvatarUrl(channel.id)}
+                src={channelAPI.getAvatarUrl(channel.id, channel.avatar_version)}
                 alt={channel.title}
                 className="w-24 h-24 rounded-full"
               />
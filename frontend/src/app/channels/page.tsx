@@ -306,7 +306,7 @@ export default function ChannelsPage() {
               <div className="h-24 bg-youtube-lightgray relative">
                 {channel.banner_url && (
                   <img
-                    src={channelAPI.getBannerUrl(channel.id)}
+                    src={channelAPI.getBannerUrl(channel.id, channel.banner_version)}
                     alt=""
                     className="w-full h-full object-cover"
                   />
@@ -330,7 +330,7 @@ export default function ChannelsPage() {
                   {/* Avatar */}
                   {channel.avatar_url ? (
                     <img
-                      src={channelAPI.getAvatarUrl(channel.id)}
+                      src={channelAPI.getAvatarUrl(channel.id, channel.avatar_version)}
                       alt={channel.title}
                       className="w-14 h-14 rounded-full"
                     />
@@ -10,9 +10,17 @@ interface CommentSectionProps {
   videoId: number;
 }
 
-function CommentItem({ comment, onLoadReplies }: { comment: Comment; onLoadReplies?: (commentId: number) => void }) {
+function CommentItem({
+  comment,
+  initialReplies = [],
+  onLoadReplies,
+}: {
+  comment: Comment;
+  initialReplies?: Comment[];
+  onLoadReplies?: (commentId: number) => void;
+}) {
   const [showReplies, setShowReplies] = useState(false);
-  const [replies, setReplies] = useState<Comment[]>(comment.replies || []);
+  const [replies, setReplies] = useState<Comment[]>(initialReplies);
   const [loadingReplies, setLoadingReplies] = useState(false);
 
   const handleShowReplies = async () => {
@@ -99,6 +107,7 @@ function CommentItem({ comment, onLoadReplies }: { comment: Comment; onLoadRepli
 
 export function CommentSection({ videoId }: CommentSectionProps) {
   const [comments, setComments] = useState<Comment[]>([]);
+  const [repliesByParent, setRepliesByParent] = useState<Record<number, Comment[]>>({});
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [page, setPage] = useState(1);
@@ -120,6 +129,15 @@ export function CommentSection({ videoId }: CommentSectionProps) {
         per_page: 20,
         sort_by: sortBy,
       });
+      // Replies arrive flat; attach them to their parents via the index
+      const replyById = new Map((response.replies || []).map((reply) => [reply.id, reply]));
+      const grouped: Record<number, Comment[]> = {};
+      for (const [parentId, replyIds] of Object.entries(response.replies_index || {})) {
+        grouped[Number(parentId)] = replyIds
+          .map((id) => replyById.get(id))
+          .filter((reply): reply is Comment => reply !== undefined);
+      }
+      setRepliesByParent(grouped);
       setComments(response.comments);
       setTotalPages(response.total_pages);
       setTotal(response.total);
@@ -188,7 +206,11 @@ export function CommentSection({ videoId }: CommentSectionProps) {
       ) : (
         <div className="space-y-6">
           {comments.map((comment) => (
-            <CommentItem key={comment.id} comment={comment} />
+            <CommentItem
+              key={comment.id}
+              comment={comment}
+              initialReplies={repliesByParent[comment.id]}
+            />
           ))}
         </div>
       )}
@@ -71,11 +71,13 @@ export const channelAPI = {
       body: JSON.stringify({ youtube_channel_id, youtube_api_key }),
     }),
 
-  // Get banner URL for a channel
-  getBannerUrl: (id: number) => `${API_BASE}/api/v1/channels/${id}/banner`,
+  // Get banner URL for a channel (versioned URLs are cached indefinitely)
+  getBannerUrl: (id: number, version?: string) =>
+    `${API_BASE}/api/v1/channels/${id}/banner${version ? `?v=${version}` : ''}`,
 
-  // Get avatar URL for a channel
-  getAvatarUrl: (id: number) => `${API_BASE}/api/v1/channels/${id}/avatar`,
+  // Get avatar URL for a channel (versioned URLs are cached indefinitely)
+  getAvatarUrl: (id: number, version?: string) =>
+    `${API_BASE}/api/v1/channels/${id}/avatar${version ? `?v=${version}` : ''}`,
 };
 
 // Videos API
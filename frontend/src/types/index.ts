@@ -9,6 +9,8 @@ export interface Channel {
   view_count?: number;
   banner_url?: string;
   avatar_url?: string;
+  banner_version?: string;
+  avatar_version?: string;
   created_at: string;
   updated_at: string;
 }
@@ -61,7 +63,6 @@ export interface Comment {
   published_at?: string;
   is_top_level: boolean;
   created_at: string;
-  replies: Comment[];
 }
 
 export interface CommentListResponse {
@@ -70,6 +71,8 @@ export interface CommentListResponse {
   page: number;
   per_page: number;
   total_pages: number;
+  replies?: Comment[];
+  replies_index?: Record<string, number[]>;
 }
 
 export interface SyncConfig {